@@ -37,6 +37,7 @@ from .config import (
     PROVIDER_PRESETS,
     CURRENT_CONFIG_VERSION,
     load_config,
+    get_config,
     save_config,
     validate_config,
     is_configured,
@@ -100,6 +101,7 @@ __all__ = [
     "CURRENT_CONFIG_VERSION",
     # Config functions
     "load_config",
+    "get_config",
     "save_config",
     "validate_config",
     "is_configured",
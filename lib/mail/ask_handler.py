@@ -16,7 +16,6 @@ from typing import Optional, TYPE_CHECKING
 
 from .body_parser import BodyParser, ParsedMessage
 from .router import RoutedMessage
-from .filters import clean_email_body
 
 if TYPE_CHECKING:
     from .config import MailConfig
@@ -62,6 +61,25 @@ class AskHandler:
             valid_providers=SUPPORTED_PROVIDERS,
         )
 
+        # Persistent SMTP sender, created lazily on first reply so a single
+        # connection is reused across replies instead of a fresh
+        # TLS handshake + AUTH per email.
+        self._sender = None
+
+        # Resolve the ask command once; handle_email would otherwise stat
+        # up to three candidate paths per incoming email.
+        self._ask_cmd = self._find_ask_command()
+
+        # Snapshot the environment once so each email only overlays the
+        # CCB_* keys instead of copying 100+ entries per submission.
+        self._base_env = dict(os.environ)
+
+    def close(self) -> None:
+        """Release the persistent SMTP connection (call on shutdown)."""
+        if self._sender is not None:
+            self._sender.disconnect()
+            self._sender = None
+
     def _get_work_dir(self) -> str:
         """Get working directory for ASK command."""
         if self.default_work_dir:
@@ -117,8 +135,10 @@ class AskHandler:
     def _send_email_reply(self, msg: RoutedMessage, provider: str, reply: str) -> bool:
         """Send email reply directly."""
         try:
-            from .sender import SmtpSender
-            sender = SmtpSender(self.config)
+            if self._sender is None:
+                from .sender import SmtpSender
+                self._sender = SmtpSender(self.config)
+            sender = self._sender
 
             # Build unified subject with project name only
             work_dir = self._get_work_dir()
@@ -141,6 +161,8 @@ class AskHandler:
             return success
         except Exception as e:
             print(f"[maild] Error sending email reply: {e}")
+            # Drop the sender so the next reply starts from a clean connection
+            self._sender = None
             return False
 
     def handle_email(self, msg: RoutedMessage) -> AskResult:
@@ -161,30 +183,18 @@ class AskHandler:
         # Debug: log raw body
         print(f"[maild] DEBUG raw body ({len(msg.body)} chars): {repr(msg.body[:500])}")
 
-        # Clean email body first (remove quoted replies, signatures)
-        clean_body = clean_email_body(msg.body)
-        print(f"[maild] DEBUG clean body ({len(clean_body)} chars): {repr(clean_body[:200])}")
+        # Clean body, extract provider, and prepend subject in one pass
+        parsed = self.parser.parse_email(msg.body, msg.subject)
+        print(f"[maild] DEBUG parsed message ({len(parsed.message)} chars): {repr(parsed.message[:200])}")
 
-        if not clean_body:
+        if not parsed.message:
             return AskResult(
                 success=False,
                 message="Empty content after cleaning",
             )
 
-        # Parse provider from body
-        parsed = self.parser.parse(clean_body)
         provider = parsed.provider or self.default_provider
-        message = parsed.message or clean_body
-
-        # Include subject in message if present
-        if msg.subject:
-            # Strip common prefixes
-            subject = msg.subject
-            for prefix in ["Re:", "RE:", "Fwd:", "FW:"]:
-                if subject.startswith(prefix):
-                    subject = subject[len(prefix):].strip()
-            if subject and not subject.startswith("[CCB]"):
-                message = f"Subject: {subject}\n\n{message}"
+        message = parsed.message
 
         # Generate request ID
         request_id = f"email-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
@@ -193,22 +203,27 @@ class AskHandler:
         if not self._save_email_context(msg, request_id):
             print(f"[maild] Warning: failed to save email context (req={request_id})")
 
-        # Find ask command
-        ask_cmd = self._find_ask_command()
+        # Use the ask command resolved at init (retry once if it was
+        # missing then, e.g. installed after the daemon started)
+        if self._ask_cmd is None:
+            self._ask_cmd = self._find_ask_command()
+        ask_cmd = self._ask_cmd
         if not ask_cmd:
             return AskResult(
                 success=False,
                 message="ask command not found",
             )
 
-        # Prepare environment
+        # Prepare environment (overlay CCB_* keys on the cached snapshot)
         work_dir = self._get_work_dir()
-        env = os.environ.copy()
-        env["CCB_CALLER"] = "email"
-        env["CCB_EMAIL_REQ_ID"] = request_id
-        env["CCB_EMAIL_MSG_ID"] = msg.message_id or ""
-        env["CCB_EMAIL_FROM"] = msg.from_addr or ""
-        env["CCB_WORK_DIR"] = work_dir
+        env = {
+            **self._base_env,
+            "CCB_CALLER": "email",
+            "CCB_EMAIL_REQ_ID": request_id,
+            "CCB_EMAIL_MSG_ID": msg.message_id or "",
+            "CCB_EMAIL_FROM": msg.from_addr or "",
+            "CCB_WORK_DIR": work_dir,
+        }
         if "CCB_RUN_DIR" not in env and work_dir:
             env["CCB_RUN_DIR"] = work_dir
 
@@ -5,9 +5,11 @@ Downloads and caches email attachments for processing by AI providers.
 """
 
 import hashlib
+import itertools
 import os
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
@@ -56,6 +58,7 @@ def save_attachment(
     filename: str,
     content: bytes,
     content_type: str,
+    msg_dir: Optional[Path] = None,
 ) -> Optional[CachedAttachment]:
     """
     Save an attachment to the cache.
@@ -65,6 +68,9 @@ def save_attachment(
         filename: Original filename
         content: Attachment content bytes
         content_type: MIME content type
+        msg_dir: Pre-created message cache directory. Pass this when
+                 saving several attachments of one message to avoid a
+                 mkdir per attachment.
 
     Returns:
         CachedAttachment info or None if failed
@@ -73,28 +79,35 @@ def save_attachment(
         print(f"Warning: Attachment {filename} exceeds size limit, skipping")
         return None
 
-    ensure_cache_dir()
-    msg_dir = get_message_cache_dir(message_id)
-    msg_dir.mkdir(parents=True, exist_ok=True)
+    if msg_dir is None:
+        msg_dir = get_message_cache_dir(message_id)
+        # parents=True also creates the cache root, so no separate
+        # ensure_cache_dir() call is needed
+        msg_dir.mkdir(parents=True, exist_ok=True)
 
     # Sanitize filename
     safe_filename = "".join(c for c in filename if c.isalnum() or c in "._-")
     if not safe_filename:
         safe_filename = "attachment"
 
-    local_path = msg_dir / safe_filename
-
-    # Handle duplicate filenames
-    counter = 1
-    while local_path.exists():
-        name, ext = os.path.splitext(safe_filename)
-        local_path = msg_dir / f"{name}_{counter}{ext}"
-        counter += 1
+    # Handle duplicate filenames atomically: O_EXCL claims the name in a
+    # single syscall (no exists() stat race) and bakes in the 0o600 mode.
+    name, ext = os.path.splitext(safe_filename)
 
     try:
-        with open(local_path, "wb") as f:
+        for counter in itertools.count():
+            local_path = msg_dir / (safe_filename if counter == 0 else f"{name}_{counter}{ext}")
+            try:
+                fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                # Guard against a permissive umask widening the mode;
+                # fchmod on the open fd avoids a path-based chmod lookup.
+                os.fchmod(fd, 0o600)
+                break
+            except FileExistsError:
+                continue
+
+        with os.fdopen(fd, "wb") as f:
             f.write(content)
-        local_path.chmod(0o600)
 
         return CachedAttachment(
             filename=filename,
@@ -120,10 +133,13 @@ def extract_attachments(msg: EmailMessage, message_id: str, include_inline: bool
     Returns:
         List of CachedAttachment objects
     """
-    attachments = []
-
     if not msg.is_multipart():
-        return attachments
+        return []
+
+    # First pass: collect (filename, content, content_type) tuples.
+    # msg.walk() isn't thread-safe, so decode payloads serially and only
+    # parallelize the disk writes below.
+    parts_to_save = []
 
     for part in msg.walk():
         content_disposition = part.get("Content-Disposition", "")
@@ -157,11 +173,30 @@ def extract_attachments(msg: EmailMessage, message_id: str, include_inline: bool
         if not content:
             continue
 
-        cached = save_attachment(message_id, filename, content, content_type)
-        if cached:
-            attachments.append(cached)
+        parts_to_save.append((filename, content, content_type))
 
-    return attachments
+    if not parts_to_save:
+        return []
+
+    # All attachments of one message share msg_dir; create it once here
+    # instead of once per save_attachment call
+    msg_dir = get_message_cache_dir(message_id)
+    msg_dir.mkdir(parents=True, exist_ok=True)
+
+    if len(parts_to_save) == 1:
+        filename, content, content_type = parts_to_save[0]
+        cached = save_attachment(message_id, filename, content, content_type, msg_dir=msg_dir)
+        return [cached] if cached else []
+
+    # Overlap the disk writes (os.write releases the GIL)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(save_attachment, message_id, filename, content, content_type, msg_dir)
+            for filename, content, content_type in parts_to_save
+        ]
+        results = [f.result() for f in futures]
+
+    return [cached for cached in results if cached]
 
 
 def get_cached_attachments(message_id: str) -> List[CachedAttachment]:
@@ -203,21 +238,30 @@ def cleanup_old_attachments(ttl_seconds: float = ATTACHMENT_TTL_SECONDS) -> int:
         Number of directories removed
     """
     cache_dir = get_cache_dir()
-    if not cache_dir.exists():
-        return 0
-
     now = time.time()
     removed = 0
 
-    for msg_dir in cache_dir.iterdir():
-        if not msg_dir.is_dir():
-            continue
+    # os.scandir returns type and stat info gathered during the
+    # directory read itself, so no extra stat syscall per entry; stale
+    # dirs are collected first and deleted after the handle is closed.
+    stale = []
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_dir():
+                        continue
+                    if now - entry.stat().st_mtime > ttl_seconds:
+                        stale.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        return 0
 
+    for path in stale:
         try:
-            mtime = msg_dir.stat().st_mtime
-            if now - mtime > ttl_seconds:
-                shutil.rmtree(msg_dir)
-                removed += 1
+            shutil.rmtree(path)
+            removed += 1
         except IOError:
             pass
 
@@ -9,6 +9,8 @@ import re
 from dataclasses import dataclass
 from typing import Optional
 
+from .filters import clean_email_body
+
 
 @dataclass
 class ParsedMessage:
@@ -44,6 +46,10 @@ class BodyParser:
         self.valid_providers = valid_providers
         flags = re.IGNORECASE if case_insensitive else 0
         self._regex = re.compile(pattern, flags)
+        # With the default word-prefix pattern, a body whose first char
+        # can't start \w+ can never match; cheap check skips the regex
+        # engine entirely. Custom patterns always go through the regex.
+        self._word_prefix_only = pattern == self.DEFAULT_PATTERN
 
     def parse(self, body: str) -> ParsedMessage:
         """
@@ -64,6 +70,12 @@ class BodyParser:
         if not body:
             return ParsedMessage(provider=None, message="")
 
+        # Fast path: no word prefix means no provider to extract
+        if self._word_prefix_only:
+            c = body[0]
+            if not (c.isalnum() or c == "_"):
+                return ParsedMessage(provider=None, message=body)
+
         match = self._regex.match(body)
         if not match:
             return ParsedMessage(provider=None, message=body)
@@ -116,3 +128,46 @@ class BodyParser:
             message = first_line_remainder
 
         return ParsedMessage(provider=provider, message=message.strip())
+
+    # Subject prefixes stripped before prepending the subject to the message
+    _SUBJECT_PREFIXES = ("Re:", "RE:", "Fwd:", "FW:")
+
+    def parse_email(self, raw_body: str, subject: Optional[str] = None) -> ParsedMessage:
+        """
+        Clean a raw email body, extract the provider prefix, and prepend
+        the subject — in a single pass over the text.
+
+        Fuses clean_email_body + parse + the caller-side subject handling
+        so the body is walked once and the final message is built with a
+        single allocation.
+
+        Args:
+            raw_body: Raw email body (quotes/signatures still present)
+            subject: Optional email subject to prepend
+
+        Returns:
+            ParsedMessage; message is "" when nothing remains after cleaning
+        """
+        body = clean_email_body(raw_body)
+        if not body:
+            return ParsedMessage(provider=None, message="")
+
+        provider = None
+        message = body
+        if not self._word_prefix_only or body[0].isalnum() or body[0] == "_":
+            match = self._regex.match(body)
+            if match:
+                candidate = match.group(1).lower()
+                if not self.valid_providers or candidate in self.valid_providers:
+                    provider = candidate
+                    # Fall back to the full body if only the prefix was sent
+                    message = body[match.end():].strip() or body
+
+        if subject:
+            for prefix in self._SUBJECT_PREFIXES:
+                if subject.startswith(prefix):
+                    subject = subject[len(prefix):].strip()
+            if subject and not subject.startswith("[CCB]"):
+                message = f"Subject: {subject}\n\n{message}"
+
+        return ParsedMessage(provider=provider, message=message)
@@ -17,16 +17,67 @@ Version 2 (deprecated): Pane-based mail notification system
 - polling: IMAP polling settings
 """
 
+import functools
 import json
 import os
-from dataclasses import dataclass, field, asdict
+import pickle
+import re
+from dataclasses import dataclass, field, fields, is_dataclass, replace
 from pathlib import Path
 from typing import Optional, Dict, Any, Literal, List
 
+# Prefer a C JSON codec for config (de)serialization when installed
+# (orjson first, then msgspec); the stdlib fallback keeps the package
+# dependency-free. A full msgspec.Struct schema would be faster still
+# but is incompatible with the dataclass subclassing/property API that
+# the rest of the tree relies on.
+try:
+    import orjson
+
+    def _json_loads(raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+    def _json_dumps(obj: Any) -> bytes:
+        # orjson walks dataclasses natively, so config objects can be
+        # passed straight through without a to_dict() tree
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+    try:
+        import msgspec.json as _msgspec_json
+
+        def _json_loads(raw: bytes) -> Any:
+            return _msgspec_json.decode(raw)
+
+        def _json_dumps(obj: Any) -> bytes:
+            # msgspec also encodes dataclasses directly
+            return _msgspec_json.format(_msgspec_json.encode(obj), indent=2)
+
+    except ImportError:
+
+        class _DataclassEncoder(json.JSONEncoder):
+            """Encoder that emits dataclasses level by level, avoiding
+            the up-front construction of the full to_dict() tree."""
+
+            def default(self, o: Any) -> Any:
+                if is_dataclass(o):
+                    return {f.name: getattr(o, f.name) for f in fields(o)}
+                return super().default(o)
+
+        def _json_loads(raw: bytes) -> Any:
+            return json.loads(raw)
+
+        def _json_dumps(obj: Any) -> bytes:
+            return json.dumps(
+                obj, indent=2, ensure_ascii=False, cls=_DataclassEncoder
+            ).encode("utf-8")
+
 # Default configuration directory
 DEFAULT_CONFIG_DIR = Path.home() / ".ccb" / "mail"
 CONFIG_FILE = "config.json"
 THREADS_FILE = "threads.json"
+# Pickled MailConfigV3 used to skip JSON parsing on cold start
+CONFIG_CACHE_FILE = "config.cache.pkl"
 
 # Current config version
 CURRENT_CONFIG_VERSION = 3
@@ -58,7 +109,28 @@ PROVIDER_PRESETS: Dict[str, Dict[str, Any]] = {
 }
 
 
-@dataclass
+def _with_generated_from_dict(cls):
+    """Install a straight-line from_dict classmethod generated from the
+    dataclass's fields.
+
+    The generated code inlines every field name and constant default,
+    so decode costs a fixed sequence of dict lookups with no per-field
+    interpretation. Only suitable for flat classes whose defaults are
+    simple constants; nested configs keep handwritten converters.
+    """
+    args = ", ".join(
+        f"{f.name}=data.get({f.name!r}, {f.default!r})" for f in fields(cls)
+    )
+    namespace: Dict[str, Any] = {}
+    exec(f"def from_dict(cls, data):\n    return cls({args})", namespace)
+    from_dict = namespace["from_dict"]
+    from_dict.__doc__ = f"Build a {cls.__name__} from a plain dict."
+    cls.from_dict = classmethod(from_dict)
+    return cls
+
+
+@_with_generated_from_dict
+@dataclass(slots=True)
 class ImapConfig:
     """IMAP server configuration."""
     host: str = ""
@@ -66,18 +138,15 @@ class ImapConfig:
     ssl: bool = True
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "ImapConfig":
-        return cls(
-            host=data.get("host", ""),
-            port=data.get("port", 993),
-            ssl=data.get("ssl", True),
-        )
+        return {
+            "host": self.host,
+            "port": self.port,
+            "ssl": self.ssl,
+        }
 
 
-@dataclass
+@_with_generated_from_dict
+@dataclass(slots=True)
 class SmtpConfig:
     """SMTP server configuration."""
     host: str = ""
@@ -86,19 +155,15 @@ class SmtpConfig:
     starttls: bool = True
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "SmtpConfig":
-        return cls(
-            host=data.get("host", ""),
-            port=data.get("port", 587),
-            ssl=data.get("ssl", False),
-            starttls=data.get("starttls", True),
-        )
+        return {
+            "host": self.host,
+            "port": self.port,
+            "ssl": self.ssl,
+            "starttls": self.starttls,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceAccountConfig:
     """Service email account configuration (CCB's mailbox)."""
     provider: str = "custom"  # gmail, outlook, qq, custom
@@ -126,22 +191,31 @@ class ServiceAccountConfig:
     @classmethod
     def from_preset(cls, provider: str, email: str) -> "ServiceAccountConfig":
         """Create account config from a provider preset."""
-        if provider not in PROVIDER_PRESETS:
+        if provider not in _PRESETS_BUILT:
             raise ValueError(f"Unknown provider: {provider}")
-        preset = PROVIDER_PRESETS[provider]
+        imap, smtp = _PRESETS_BUILT[provider]
+        # replace() hands each caller its own copy of the preset objects
         return cls(
             provider=provider,
             email=email,
-            imap=ImapConfig.from_dict(preset["imap"]),
-            smtp=SmtpConfig.from_dict(preset["smtp"]),
+            imap=replace(imap),
+            smtp=replace(smtp),
         )
 
 
 # Alias for backward compatibility
 AccountConfig = ServiceAccountConfig
 
+# Presets pre-parsed into config objects at import so from_preset is a
+# dict lookup plus two copies instead of repeated from_dict construction
+_PRESETS_BUILT: Dict[str, tuple] = {
+    name: (ImapConfig.from_dict(preset["imap"]), SmtpConfig.from_dict(preset["smtp"]))
+    for name, preset in PROVIDER_PRESETS.items()
+}
+
 
-@dataclass
+@_with_generated_from_dict
+@dataclass(slots=True)
 class PaneHookConfig:
     """Configuration for a single pane's mail notification hook."""
     enabled: bool = False
@@ -153,15 +227,9 @@ class PaneHookConfig:
             "notify_mode": self.notify_mode,
         }
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "PaneHookConfig":
-        return cls(
-            enabled=data.get("enabled", False),
-            notify_mode=data.get("notify_mode", "on_completion"),
-        )
-
 
-@dataclass
+@_with_generated_from_dict
+@dataclass(slots=True)
 class NotificationConfig:
     """Email notification formatting settings."""
     include_context_lines: int = 50
@@ -169,18 +237,15 @@ class NotificationConfig:
     subject_prefix: str = "[CCB]"
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "NotificationConfig":
-        return cls(
-            include_context_lines=data.get("include_context_lines", 50),
-            max_email_length=data.get("max_email_length", 10000),
-            subject_prefix=data.get("subject_prefix", "[CCB]"),
-        )
+        return {
+            "include_context_lines": self.include_context_lines,
+            "max_email_length": self.max_email_length,
+            "subject_prefix": self.subject_prefix,
+        }
 
 
-@dataclass
+@_with_generated_from_dict
+@dataclass(slots=True)
 class PollingConfig:
     """IMAP polling configuration."""
     interval_seconds: int = 30
@@ -190,17 +255,13 @@ class PollingConfig:
     idle_timeout: int = 300  # IDLE timeout in seconds (re-issue IDLE after this)
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "PollingConfig":
-        return cls(
-            interval_seconds=data.get("interval_seconds", 30),
-            folder=data.get("folder", "INBOX"),
-            mark_as_read=data.get("mark_as_read", True),
-            use_idle=data.get("use_idle", True),
-            idle_timeout=data.get("idle_timeout", 300),
-        )
+        return {
+            "interval_seconds": self.interval_seconds,
+            "folder": self.folder,
+            "mark_as_read": self.mark_as_read,
+            "use_idle": self.use_idle,
+            "idle_timeout": self.idle_timeout,
+        }
 
 
 def _default_pane_hooks() -> Dict[str, PaneHookConfig]:
@@ -208,7 +269,15 @@ def _default_pane_hooks() -> Dict[str, PaneHookConfig]:
     return {provider: PaneHookConfig() for provider in SUPPORTED_PROVIDERS}
 
 
-@dataclass
+# Dict-form default pane hooks, shallow-copied during migration instead
+# of being rebuilt entry by entry
+_DEFAULT_PANE_HOOKS_TEMPLATE: Dict[str, Dict[str, Any]] = {
+    provider: {"enabled": False, "notify_mode": "on_completion"}
+    for provider in SUPPORTED_PROVIDERS
+}
+
+
+@dataclass(slots=True)
 class MailConfig:
     """Main mail configuration (version 2)."""
     version: int = CURRENT_CONFIG_VERSION
@@ -278,7 +347,7 @@ class MailConfig:
 MailConfigV2 = MailConfig
 
 
-@dataclass
+@dataclass(slots=True)
 class MailConfigV3(MailConfig):
     """Mail configuration version 3 (ASK-based).
 
@@ -291,8 +360,19 @@ class MailConfigV3(MailConfig):
     provider_prefix_pattern: str = r"^(\w+)"
     case_insensitive: bool = True
 
+    @property
+    def compiled_prefix(self) -> "re.Pattern":
+        """Compiled provider_prefix_pattern.
+
+        Cached per (pattern, flags) via lru_cache — slots=True rules out
+        cached_property — so per-message consumers never recompile.
+        """
+        return _compile_prefix_pattern(self.provider_prefix_pattern, self.case_insensitive)
+
     def to_dict(self) -> Dict[str, Any]:
-        data = super().to_dict()
+        # Explicit parent call: slots=True recreates the class, which
+        # breaks zero-argument super() inside dataclass methods
+        data = MailConfig.to_dict(self)
         data["default_work_dir"] = self.default_work_dir
         data["default_provider"] = self.default_provider
         data["provider_prefix_pattern"] = self.provider_prefix_pattern
@@ -323,8 +403,13 @@ class MailConfigV3(MailConfig):
         )
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_dir() -> Path:
-    """Get the mail configuration directory."""
+    """Get the mail configuration directory.
+
+    Cached for the process lifetime; call get_config_dir.cache_clear()
+    if CCB_MAIL_CONFIG_DIR changes at runtime (tests).
+    """
     config_dir = Path(os.environ.get("CCB_MAIL_CONFIG_DIR", DEFAULT_CONFIG_DIR))
     return config_dir
 
@@ -332,12 +417,23 @@ def get_config_dir() -> Path:
 def ensure_config_dir() -> Path:
     """Ensure the configuration directory exists with proper permissions."""
     config_dir = get_config_dir()
-    config_dir.mkdir(parents=True, exist_ok=True)
-    # Set directory permissions to 700 (owner only)
+    try:
+        config_dir.mkdir(parents=True)
+    except FileExistsError:
+        # Already exists with its permissions set; skip the chmod syscall
+        return config_dir
+    # Set directory permissions to 700 (owner only) on creation
     config_dir.chmod(0o700)
     return config_dir
 
 
+@functools.lru_cache(maxsize=8)
+def _compile_prefix_pattern(pattern: str, case_insensitive: bool) -> "re.Pattern":
+    """Compile a provider prefix pattern (memoized)."""
+    flags = re.IGNORECASE if case_insensitive else 0
+    return re.compile(pattern, flags)
+
+
 def get_config_path() -> Path:
     """Get the path to the configuration file."""
     return get_config_dir() / CONFIG_FILE
@@ -363,13 +459,9 @@ def _migrate_v1_to_v2(data: Dict[str, Any]) -> Dict[str, Any]:
         # Use first allowed sender as target
         v2_data["target_email"] = routing["allowed_senders"][0]
 
-    # Create default pane_hooks
-    v2_data["pane_hooks"] = {}
-    for provider in SUPPORTED_PROVIDERS:
-        v2_data["pane_hooks"][provider] = {
-            "enabled": False,
-            "notify_mode": "on_completion",
-        }
+    # Create default pane_hooks (shallow copies of the frozen template;
+    # v3 keeps them for compatibility only)
+    v2_data["pane_hooks"] = {k: dict(v) for k, v in _DEFAULT_PANE_HOOKS_TEMPLATE.items()}
 
     # Default notification settings
     v2_data["notification"] = {
@@ -396,14 +488,95 @@ def _migrate_v2_to_v3(data: Dict[str, Any]) -> Dict[str, Any]:
     return v3_data
 
 
+# Parsed config cached by (path, st_mtime_ns, st_size); a single stat()
+# per load_config() call detects external changes
+_CONFIG_CACHE: Optional[tuple] = None
+
+# Process-wide config instance, loaded lazily by get_config()
+_lazy_config: Optional["MailConfigV3"] = None
+
+
+def invalidate_config_cache() -> None:
+    """Drop the cached parsed config (forces a re-read on next load)."""
+    global _CONFIG_CACHE, _lazy_config
+    _CONFIG_CACHE = None
+    _lazy_config = None
+
+
+def get_config() -> "MailConfigV3":
+    """Get the process-wide mail config, loading it on first use.
+
+    Unlike load_config() this never re-stats the file once loaded; use it
+    on paths that just need a config snapshot (e.g. is_configured()).
+    """
+    global _lazy_config
+    if _lazy_config is None:
+        _lazy_config = load_config()
+    return _lazy_config
+
+
+def _get_pickle_cache_path() -> Path:
+    return get_config_dir() / CONFIG_CACHE_FILE
+
+
+def _read_pickle_cache(config_st: os.stat_result) -> Optional[MailConfigV3]:
+    """Return the pickled config if it is at least as new as config.json."""
+    cache_path = _get_pickle_cache_path()
+    try:
+        if os.stat(cache_path).st_mtime_ns < config_st.st_mtime_ns:
+            return None
+        with open(cache_path, "rb") as f:
+            config = pickle.load(f)
+    except Exception:
+        return None
+    return config if isinstance(config, MailConfigV3) else None
+
+
+def _write_pickle_cache(config: MailConfigV3) -> None:
+    """Best-effort refresh of the pickled config cache."""
+    cache_path = _get_pickle_cache_path()
+    tmp_path = cache_path.with_suffix(".pkl.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
 def load_config() -> MailConfigV3:
-    """Load mail configuration from file, migrating if necessary."""
+    """Load mail configuration from file, migrating if necessary.
+
+    The parsed config is cached and only re-read when stat() reports the
+    file changed, so repeated calls cost one syscall instead of a full
+    JSON parse.
+    """
+    global _CONFIG_CACHE
     config_path = get_config_path()
-    if not config_path.exists():
+    try:
+        st = os.stat(config_path)
+    except OSError:
         return MailConfigV3()
+
+    if _CONFIG_CACHE is not None:
+        cached_path, mtime_ns, size, cached_config = _CONFIG_CACHE
+        if cached_path == config_path and mtime_ns == st.st_mtime_ns and size == st.st_size:
+            return cached_config
+
+    # Cold start: unpickling beats JSON parse + dataclass construction,
+    # and the cache is only served when it isn't older than config.json
+    config = _read_pickle_cache(st)
+    if config is not None:
+        _CONFIG_CACHE = (config_path, st.st_mtime_ns, st.st_size, config)
+        return config
+
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(config_path, "rb") as f:
+            data = _json_loads(f.read())
 
         # Check version and migrate if needed
         version = data.get("version", 1)
@@ -418,20 +591,48 @@ def load_config() -> MailConfigV3:
             save_config(config)
             return config
 
-        return MailConfigV3.from_dict(data)
-    except (json.JSONDecodeError, IOError) as e:
+        config = MailConfigV3.from_dict(data)
+        _CONFIG_CACHE = (config_path, st.st_mtime_ns, st.st_size, config)
+        _write_pickle_cache(config)
+        return config
+    except (ValueError, OSError) as e:
         print(f"Warning: Failed to load mail config: {e}")
         return MailConfigV3()
 
 
 def save_config(config: "MailConfig") -> None:
     """Save mail configuration to file."""
+    global _CONFIG_CACHE
     ensure_config_dir()
     config_path = get_config_path()
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config.to_dict(), f, indent=2, ensure_ascii=False)
-    # Set file permissions to 600 (owner read/write only)
-    config_path.chmod(0o600)
+    # Write-to-temp + atomic rename: a crash mid-write can no longer
+    # leave a truncated config.json behind
+    tmp_path = config_path.with_suffix(".json.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            # Serialize the object directly; all three codec branches
+            # walk dataclasses without an intermediate to_dict() tree
+            f.write(_json_dumps(config))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, config_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    # Refresh the caches so the next load reuses this object
+    if isinstance(config, MailConfigV3):
+        global _lazy_config
+        st = os.stat(config_path)
+        _CONFIG_CACHE = (config_path, st.st_mtime_ns, st.st_size, config)
+        _lazy_config = config
+        _write_pickle_cache(config)
+    else:
+        invalidate_config_cache()
 
 
 def get_threads_path() -> Path:
@@ -458,7 +659,7 @@ def validate_config(config: MailConfig) -> List[str]:
 
 def is_configured() -> bool:
     """Check if mail system is properly configured."""
-    config = load_config()
+    config = get_config()
     return bool(
         config.service_account.email
         and config.service_account.imap.host
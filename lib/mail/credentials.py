@@ -6,9 +6,12 @@ for security. Falls back to encrypted file storage if keyring is unavailable.
 """
 
 import base64
+import functools
 import hashlib
 import json
 import os
+import struct
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -20,14 +23,25 @@ KEYRING_USERNAME = "mail-credentials"
 FALLBACK_CREDS_FILE = "credentials.enc"
 
 
+# Cached keyring probe result: None = not probed yet, (module_or_None,)
+# once probed. Backend discovery can cost a D-Bus/Keychain round trip,
+# so it runs at most once per process.
+_KEYRING_CACHE: Optional[tuple] = None
+
+
 def _get_keyring():
-    """Get keyring module if available."""
+    """Get keyring module if available (probed once, then cached)."""
+    global _KEYRING_CACHE
+    if _KEYRING_CACHE is not None:
+        return _KEYRING_CACHE[0]
     try:
         import keyring
         # Test if keyring backend is functional
         keyring.get_keyring()
+        _KEYRING_CACHE = (keyring,)
         return keyring
     except (ImportError, Exception):
+        _KEYRING_CACHE = (None,)
         return None
 
 
@@ -37,9 +51,13 @@ def _get_fallback_path() -> Path:
     return get_config_dir() / FALLBACK_CREDS_FILE
 
 
-def _derive_key(salt: bytes) -> bytes:
-    """Derive encryption key from machine-specific data."""
-    # Use machine ID + username as key material
+@functools.lru_cache(maxsize=1)
+def _get_key_material() -> bytes:
+    """Key material from machine-specific data (computed once).
+
+    Lazy rather than module-level because os.getlogin() can raise in
+    detached environments and shouldn't break import.
+    """
     machine_id = ""
     try:
         with open("/etc/machine-id", "r") as f:
@@ -47,17 +65,38 @@ def _derive_key(salt: bytes) -> bytes:
     except FileNotFoundError:
         pass
 
-    key_material = f"{machine_id}:{os.getlogin()}:{KEYRING_SERVICE}"
-    return hashlib.pbkdf2_hmac("sha256", key_material.encode(), salt, 100000)
+    return f"{machine_id}:{os.getlogin()}:{KEYRING_SERVICE}".encode()
+
+
+@functools.lru_cache(maxsize=32)
+def _derive_key(salt: bytes) -> bytes:
+    """Derive encryption key from machine-specific data.
+
+    PBKDF2 with 100k iterations costs tens of ms; memoizing by salt
+    means repeated decrypts of the same file derive the key once.
+    """
+    return hashlib.pbkdf2_hmac("sha256", _get_key_material(), salt, 100000)
+
+
+def _xor_with_key(data: bytes, key: bytes) -> bytes:
+    """XOR data against a key tiled to the same length.
+
+    Implemented as a single bigint XOR: CPython's int ^ runs in C over
+    30-bit digits, so a multi-KB buffer costs a handful of C-level ops
+    instead of one Python dispatch per byte.
+    """
+    if not data:
+        return b""
+    keystream = (key * (len(data) // len(key) + 1))[:len(data)]
+    xored = int.from_bytes(data, "big") ^ int.from_bytes(keystream, "big")
+    return xored.to_bytes(len(data), "big")
 
 
 def _simple_encrypt(data: str) -> str:
     """Simple XOR-based encryption for fallback storage."""
     salt = os.urandom(16)
     key = _derive_key(salt)
-    data_bytes = data.encode("utf-8")
-    # XOR encryption
-    encrypted = bytes(b ^ key[i % len(key)] for i, b in enumerate(data_bytes))
+    encrypted = _xor_with_key(data.encode("utf-8"), key)
     # Combine salt + encrypted data
     combined = salt + encrypted
     return base64.b64encode(combined).decode("ascii")
@@ -69,9 +108,107 @@ def _simple_decrypt(encrypted_data: str) -> str:
     salt = combined[:16]
     encrypted = combined[16:]
     key = _derive_key(salt)
-    # XOR decryption
-    decrypted = bytes(b ^ key[i % len(key)] for i, b in enumerate(encrypted))
-    return decrypted.decode("utf-8")
+    return _xor_with_key(encrypted, key).decode("utf-8")
+
+
+# Magic header for the packed binary credentials format. Legacy files
+# (base64 of salt + XOR'd JSON) never start with these bytes since
+# base64 text contains no NUL.
+_CREDS_MAGIC = b"CCB\x02"
+
+
+def _pack_creds(creds: dict) -> bytes:
+    """Pack credentials as length-prefixed binary records."""
+    parts = []
+    for email, password in creds.items():
+        e = email.encode("utf-8")
+        p = password.encode("utf-8")
+        parts.append(struct.pack("!H", len(e)))
+        parts.append(e)
+        parts.append(struct.pack("!H", len(p)))
+        parts.append(p)
+    return b"".join(parts)
+
+
+def _unpack_creds(raw: bytes) -> dict:
+    """Inverse of _pack_creds."""
+    creds = {}
+    offset = 0
+    end = len(raw)
+    while offset < end:
+        (length,) = struct.unpack_from("!H", raw, offset)
+        offset += 2
+        email = raw[offset:offset + length].decode("utf-8")
+        offset += length
+        (length,) = struct.unpack_from("!H", raw, offset)
+        offset += 2
+        creds[email] = raw[offset:offset + length].decode("utf-8")
+        offset += length
+    return creds
+
+
+# Decrypted fallback credentials cached by mtime so rapid credential
+# ops don't re-run the decrypt+parse cycle per call
+_FALLBACK_LOCK = threading.Lock()
+_FALLBACK_CREDS_CACHE: Optional[tuple] = None  # (st_mtime_ns, creds dict)
+
+
+def _load_fallback_creds() -> dict:
+    """Load the fallback credentials dict, reusing the cached copy
+    unless the file's mtime changed. Caller must hold _FALLBACK_LOCK."""
+    global _FALLBACK_CREDS_CACHE
+    fallback_path = _get_fallback_path()
+    try:
+        st = os.stat(fallback_path)
+    except OSError:
+        return {}
+
+    if _FALLBACK_CREDS_CACHE is not None and _FALLBACK_CREDS_CACHE[0] == st.st_mtime_ns:
+        return _FALLBACK_CREDS_CACHE[1]
+
+    try:
+        with open(fallback_path, "rb") as f:
+            raw = f.read()
+        if raw.startswith(_CREDS_MAGIC):
+            salt = raw[4:20]
+            key = _derive_key(salt)
+            creds = _unpack_creds(_xor_with_key(raw[20:], key))
+        else:
+            # Legacy base64 + XOR'd JSON format
+            creds = json.loads(_simple_decrypt(raw.decode("ascii")))
+    except Exception:
+        return {}
+
+    _FALLBACK_CREDS_CACHE = (st.st_mtime_ns, creds)
+    return creds
+
+
+def _write_fallback_creds(creds: dict) -> None:
+    """Encrypt and write the credentials dict, refreshing the cache.
+    Caller must hold _FALLBACK_LOCK."""
+    global _FALLBACK_CREDS_CACHE
+    fallback_path = _get_fallback_path()
+    # Same atomic tmp+rename pattern as save_config: never leave a
+    # half-written credentials file behind
+    tmp_path = fallback_path.with_suffix(".enc.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.fchmod(fd, 0o600)
+        salt = os.urandom(16)
+        key = _derive_key(salt)
+        blob = _CREDS_MAGIC + salt + _xor_with_key(_pack_creds(creds), key)
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, fallback_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _FALLBACK_CREDS_CACHE = (os.stat(fallback_path).st_mtime_ns, creds)
 
 
 def store_password(email: str, password: str) -> bool:
@@ -95,22 +232,10 @@ def store_password(email: str, password: str) -> bool:
 
     # Fallback to encrypted file
     try:
-        fallback_path = _get_fallback_path()
-        creds = {}
-        if fallback_path.exists():
-            try:
-                with open(fallback_path, "r") as f:
-                    encrypted = f.read()
-                creds = json.loads(_simple_decrypt(encrypted))
-            except Exception:
-                pass
-
-        creds[email] = password
-        encrypted = _simple_encrypt(json.dumps(creds))
-
-        with open(fallback_path, "w") as f:
-            f.write(encrypted)
-        fallback_path.chmod(0o600)
+        with _FALLBACK_LOCK:
+            creds = _load_fallback_creds()
+            creds[email] = password
+            _write_fallback_creds(creds)
         return True
     except Exception as e:
         print(f"Error storing credentials: {e}")
@@ -138,12 +263,8 @@ def get_password(email: str) -> Optional[str]:
 
     # Try fallback file
     try:
-        fallback_path = _get_fallback_path()
-        if fallback_path.exists():
-            with open(fallback_path, "r") as f:
-                encrypted = f.read()
-            creds = json.loads(_simple_decrypt(encrypted))
-            return creds.get(email)
+        with _FALLBACK_LOCK:
+            return _load_fallback_creds().get(email)
     except Exception:
         pass
 
@@ -172,16 +293,11 @@ def delete_password(email: str) -> bool:
 
     # Also try to remove from fallback
     try:
-        fallback_path = _get_fallback_path()
-        if fallback_path.exists():
-            with open(fallback_path, "r") as f:
-                encrypted = f.read()
-            creds = json.loads(_simple_decrypt(encrypted))
+        with _FALLBACK_LOCK:
+            creds = _load_fallback_creds()
             if email in creds:
                 del creds[email]
-                encrypted = _simple_encrypt(json.dumps(creds))
-                with open(fallback_path, "w") as f:
-                    f.write(encrypted)
+                _write_fallback_creds(creds)
                 deleted = True
     except Exception:
         pass
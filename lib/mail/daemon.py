@@ -15,15 +15,16 @@ import subprocess
 import signal
 import sys
 import time
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from threading import Event, Thread
+from threading import Event
 from typing import Optional, Callable, List, Dict
 
 from .config import MailConfig, load_config, get_config_dir, SUPPORTED_PROVIDERS
 from .poller import ImapPoller, ImapPollerDaemon
 from .sender import SmtpSender
-from .router import RoutedMessage
+from .router import MessageRouter, RoutedMessage
 from .threads import get_thread_store, ThreadStore
 from .attachments import cleanup_old_attachments
 from .ask_handler import AskHandler
@@ -33,8 +34,25 @@ STATE_FILE = "maild.json"
 PID_FILE = "maild.pid"
 LOG_FILE = "maild.log"
 
+# Raw log fd, set once the process daemonizes (see start_daemon)
+_log_fd: Optional[int] = None
 
-@dataclass
+
+def _log(msg: str) -> None:
+    """Write one daemon log line.
+
+    When daemonized this goes straight to the log fd via os.write — one
+    syscall per line with no TextIOWrapper encode/flush machinery, which
+    matters for the daemon's frequent [maild] messages. In foreground
+    mode it falls back to print.
+    """
+    if _log_fd is not None:
+        os.write(_log_fd, (msg + "\n").encode("utf-8", "replace"))
+    else:
+        print(msg)
+
+
+@dataclass(slots=True)
 class DaemonState:
     """Daemon state for discovery."""
     pid: int
@@ -45,7 +63,15 @@ class DaemonState:
     enabled_hooks: List[str] = field(default_factory=list)
 
     def to_dict(self):
-        return asdict(self)
+        # Literal build; asdict() recursively deep-copies every field
+        return {
+            "pid": self.pid,
+            "started_at": self.started_at,
+            "email": self.email,
+            "status": self.status,
+            "version": self.version,
+            "enabled_hooks": self.enabled_hooks,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "DaemonState":
@@ -59,41 +85,96 @@ class DaemonState:
         )
 
 
+# The config dir is fixed for the process lifetime, so each path is
+# built once instead of re-joined on every state read/heartbeat.
+@lru_cache(maxsize=1)
 def get_state_path() -> Path:
     """Get path to daemon state file."""
     return get_config_dir() / STATE_FILE
 
 
+@lru_cache(maxsize=1)
 def get_pid_path() -> Path:
     """Get path to PID file."""
     return get_config_dir() / PID_FILE
 
 
+@lru_cache(maxsize=1)
 def get_log_path() -> Path:
     """Get path to log file."""
     return get_config_dir() / LOG_FILE
 
 
+@lru_cache(maxsize=1)
+def _pane_ids_path() -> Path:
+    return get_config_dir() / "pane_ids.json"
+
+
+# Parsed state files cached by (mtime_ns, size); repeat reads in the
+# same process (status checks, the daemon's own probes) skip the
+# open + json.load when the file hasn't changed. Writes bump the mtime,
+# which invalidates naturally.
+_state_cache: dict = {}
+
+
 def read_daemon_state() -> Optional[DaemonState]:
     """Read daemon state from file."""
     state_path = get_state_path()
-    if not state_path.exists():
+    try:
+        st = state_path.stat()
+    except OSError:
         return None
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _state_cache.get(state_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
     try:
         with open(state_path, "r") as f:
             data = json.load(f)
-        return DaemonState.from_dict(data)
+        state = DaemonState.from_dict(data)
     except Exception:
         return None
+    _state_cache[state_path] = (key, state)
+    return state
+
+
+def _atomic_write_text(path: Path, data: str, mode: Optional[int] = None) -> None:
+    """Write a state file atomically (tmp + fsync + rename).
+
+    A plain open("w") truncates before writing, so an interruption can
+    leave a zero-byte or partial JSON file that reads back as "daemon
+    not running" and gets the real state nuked. os.replace guarantees
+    readers see either the old or the new file, never a torn one.
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode if mode is not None else 0o666)
+    try:
+        if mode is not None:
+            os.fchmod(fd, mode)
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 def write_daemon_state(state: DaemonState) -> None:
     """Write daemon state to file."""
     state_path = get_state_path()
     state_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(state_path, "w") as f:
-        json.dump(state.to_dict(), f, indent=2)
-    state_path.chmod(0o600)
+    # Compact separators: these files are only read back by json.load,
+    # and indent=2 is the slowest path in the stdlib encoder
+    _atomic_write_text(
+        state_path,
+        json.dumps(state.to_dict(), separators=(",", ":")),
+        mode=0o600,
+    )
 
 
 def remove_daemon_state() -> None:
@@ -168,19 +249,30 @@ def _get_running_pid(state: Optional[DaemonState]) -> Optional[int]:
     return None
 
 
-def is_daemon_running() -> bool:
-    """Check if daemon is running."""
+def _probe_daemon() -> tuple:
+    """Resolve daemon state and liveness in a single pass.
+
+    Returns (state, running_pid), with (None, None) when no live daemon
+    exists. Shared by is_daemon_running and get_daemon_status so a
+    status check parses the state file and probes the PID only once.
+    Stale state files are cleaned up as a side effect.
+    """
     state = read_daemon_state()
     running_pid = _get_running_pid(state)
     if running_pid:
         if state and state.pid != running_pid:
             state.pid = running_pid
             write_daemon_state(state)
-        return True
+        return state, running_pid
 
     # Process not running, clean up stale state
     remove_daemon_state()
-    return False
+    return None, None
+
+
+def is_daemon_running() -> bool:
+    """Check if daemon is running."""
+    return _probe_daemon()[1] is not None
 
 
 class MailDaemon:
@@ -197,8 +289,13 @@ class MailDaemon:
         self.poller: Optional[ImapPollerDaemon] = None
         self.sender: Optional[SmtpSender] = None
         self.ask_handler: Optional[AskHandler] = None
+        # One router for the daemon's lifetime instead of constructing
+        # a fresh one per handled message
+        self._router = MessageRouter(self.config)
         self._stop_event = Event()
-        self._cleanup_thread: Optional[Thread] = None
+        # Next cleanup deadline (monotonic); 0 so the first poll cycle
+        # runs cleanup immediately, matching the old thread's behavior
+        self._next_cleanup = 0.0
 
     def _get_service_email(self) -> str:
         """Get service account email."""
@@ -212,35 +309,33 @@ class MailDaemon:
         Returns:
             True if message was successfully processed, False otherwise.
         """
+        # Reject unauthorized senders before any parsing/filtering work
+        if not self._router.is_sender_allowed(msg.from_addr):
+            _log(f"[maild] Rejected message from unauthorized sender: {msg.from_addr}")
+            return False
+
         # V3 mode: route to ASK system
         if self.ask_handler:
             result = self.ask_handler.handle_email(msg)
             if result.success:
-                print(f"[maild] {result.message} (req={result.request_id})")
+                _log(f"[maild] {result.message} (req={result.request_id})")
                 return True
             else:
-                print(f"[maild] ASK handler failed: {result.message}")
+                _log(f"[maild] ASK handler failed: {result.message}")
                 return False
 
-        # Fallback: validate sender and log
-        from .router import MessageRouter
-        router = MessageRouter(self.config)
-
-        if not router.is_sender_allowed(msg.from_addr):
-            print(f"[maild] Rejected message from unauthorized sender: {msg.from_addr}")
-            return False
-
-        print(f"[maild] No handler available for message: {msg.subject}")
+        # Fallback: no handler configured
+        _log(f"[maild] No handler available for message: {msg.subject}")
         return False
 
     def start(self) -> None:
         """Start the mail daemon."""
         if not self.config.enabled:
-            print("[maild] Mail service is disabled")
+            _log("[maild] Mail service is disabled")
             return
 
         if is_daemon_running():
-            print("[maild] Daemon already running")
+            _log("[maild] Daemon already running")
             return
 
         # Write state
@@ -258,33 +353,49 @@ class MailDaemon:
         with open(pid_path, "w") as f:
             f.write(str(os.getpid()))
 
-        # Setup signal handlers
-        signal.signal(signal.SIGTERM, self._handle_signal)
-        signal.signal(signal.SIGINT, self._handle_signal)
+        # Setup signal handling. On POSIX the main thread blocks
+        # SIGTERM/SIGINT and waits for them synchronously (sigwait), so
+        # the idle daemon sleeps in the kernel with zero timer wakeups;
+        # threads started below inherit the mask. Windows has no
+        # sigwait, so it keeps async handlers plus a timed wait.
+        use_sigwait = os.name != "nt" and hasattr(signal, "pthread_sigmask")
+        if use_sigwait:
+            signal.pthread_sigmask(
+                signal.SIG_BLOCK, {signal.SIGTERM, signal.SIGINT}
+            )
+        else:
+            signal.signal(signal.SIGTERM, self._handle_signal)
+            signal.signal(signal.SIGINT, self._handle_signal)
 
         # Initialize v3 ASK handler
         self.ask_handler = AskHandler(self.config)
 
-        # Start IMAP poller
-        self.poller = ImapPollerDaemon(self.config, self.message_handler)
+        # Start IMAP poller; periodic cleanup rides along on its poll
+        # cycles instead of occupying a dedicated hourly thread
+        self.poller = ImapPollerDaemon(
+            self.config,
+            self.message_handler,
+            idle_callback=self._run_cleanup_if_due,
+        )
         self.poller.start()
 
-        # Start cleanup thread
-        self._cleanup_thread = Thread(target=self._cleanup_loop, daemon=True)
-        self._cleanup_thread.start()
+        _log(f"[maild] Started for {self._get_service_email()} (v3 ASK mode)")
 
-        print(f"[maild] Started for {self._get_service_email()} (v3 ASK mode)")
-
-        # Main loop
+        # Main loop: block until termination is requested
         try:
-            while not self._stop_event.is_set():
-                self._stop_event.wait(1)
+            if use_sigwait:
+                sig = signal.sigwait({signal.SIGTERM, signal.SIGINT})
+                _log(f"[maild] Received signal {sig}")
+                self._stop_event.set()
+            else:
+                while not self._stop_event.is_set():
+                    self._stop_event.wait(1)
         finally:
             self.stop()
 
     def stop(self) -> None:
         """Stop the mail daemon."""
-        print("[maild] Stopping...")
+        _log("[maild] Stopping...")
         self._stop_event.set()
 
         if self.poller:
@@ -294,31 +405,35 @@ class MailDaemon:
             self.sender.disconnect()
 
         remove_daemon_state()
-        print("[maild] Stopped")
+        _log("[maild] Stopped")
 
     def _handle_signal(self, signum, frame) -> None:
         """Handle termination signals."""
-        print(f"[maild] Received signal {signum}")
+        _log(f"[maild] Received signal {signum}")
         self._stop_event.set()
 
-    def _cleanup_loop(self) -> None:
-        """Periodic cleanup of old data."""
-        while not self._stop_event.is_set():
-            try:
-                # Cleanup old threads
-                removed = self.thread_store.cleanup_old()
-                if removed:
-                    print(f"[maild] Cleaned up {removed} old threads")
+    def _run_cleanup_if_due(self) -> None:
+        """Periodic cleanup of old data (hourly, run on the poller thread).
+
+        Cleanup is idempotent and takes milliseconds, so piggybacking on
+        the poll cycle is safe and saves an OS thread.
+        """
+        if time.monotonic() < self._next_cleanup:
+            return
+        self._next_cleanup = time.monotonic() + 3600
 
-                # Cleanup old attachments
-                removed = cleanup_old_attachments()
-                if removed:
-                    print(f"[maild] Cleaned up {removed} old attachment dirs")
-            except Exception as e:
-                print(f"[maild] Cleanup error: {e}")
+        try:
+            # Cleanup old threads
+            removed = self.thread_store.cleanup_old()
+            if removed:
+                _log(f"[maild] Cleaned up {removed} old threads")
 
-            # Run cleanup every hour
-            self._stop_event.wait(3600)
+            # Cleanup old attachments
+            removed = cleanup_old_attachments()
+            if removed:
+                _log(f"[maild] Cleaned up {removed} old attachment dirs")
+        except Exception as e:
+            _log(f"[maild] Cleanup error: {e}")
 
 
 def start_daemon(foreground: bool = False) -> None:
@@ -374,8 +489,11 @@ def start_daemon(foreground: bool = False) -> None:
         log_fd = os.open(str(log_path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
         os.dup2(log_fd, 1)  # stdout
         os.dup2(log_fd, 2)  # stderr
-        os.close(log_fd)
-        sys.stdout = os.fdopen(1, "w", buffering=1)  # Line buffered
+        # Keep log_fd open: the daemon's own messages bypass the
+        # TextIOWrapper stack and go straight to it via _log
+        global _log_fd
+        _log_fd = log_fd
+        sys.stdout = os.fdopen(1, "w", buffering=1)  # Line buffered (3rd-party prints)
         sys.stderr = sys.stdout
 
         daemon.start()
@@ -403,13 +521,18 @@ def stop_daemon() -> bool:
         os.kill(pid, signal.SIGTERM)
         print(f"Sent SIGTERM to maild (PID: {pid})")
 
-        # Wait for process to exit
-        for _ in range(20):
+        # Wait for process to exit with exponential backoff: a cleanly
+        # exiting daemon is noticed within ~10 ms instead of after a
+        # fixed 250 ms poll tick, so `ccb mail stop` returns promptly
+        delay = 0.005
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
             if not _is_process_alive(pid):
                 print("Mail daemon stopped")
                 remove_daemon_state()
                 return True
-            time.sleep(0.25)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
 
         print("Warning: Daemon did not stop gracefully")
         return False
@@ -421,52 +544,61 @@ def stop_daemon() -> bool:
 
 def get_daemon_status() -> dict:
     """Get daemon status."""
-    state = read_daemon_state()
-    if not state:
-        return {"running": False}
-
-    running_pid = _get_running_pid(state)
-    if running_pid:
-        if state.pid != running_pid:
-            state.pid = running_pid
-            write_daemon_state(state)
-        return {
-            "running": True,
-            "pid": running_pid,
-            "email": state.email,
-            "started_at": state.started_at,
-            "uptime": time.time() - state.started_at,
-            "version": getattr(state, 'version', 1),
-            "enabled_hooks": getattr(state, 'enabled_hooks', []),
-        }
-    else:
-        remove_daemon_state()
+    state, running_pid = _probe_daemon()
+    if not running_pid:
         return {"running": False}
-
-
-def set_pane_id(provider: str, pane_id: str) -> bool:
-    """Set pane ID for a provider (for daemon to use)."""
-    state_path = get_config_dir() / "pane_ids.json"
+    if not state:
+        # Live PID file but no parsable state: running, details unknown
+        return {"running": True, "pid": running_pid}
+
+    return {
+        "running": True,
+        "pid": running_pid,
+        "email": state.email,
+        "started_at": state.started_at,
+        "uptime": time.time() - state.started_at,
+        "version": getattr(state, 'version', 1),
+        "enabled_hooks": getattr(state, 'enabled_hooks', []),
+    }
+
+
+def set_pane_ids(updates: Dict[str, str]) -> bool:
+    """Set pane IDs for several providers in one read-write cycle.
+
+    Scripts registering all providers at once pay a single
+    read/parse/write instead of one cycle per provider.
+    """
+    state_path = _pane_ids_path()
     try:
-        pane_ids = {}
-        if state_path.exists():
-            with open(state_path, "r") as f:
-                pane_ids = json.load(f)
-        pane_ids[provider] = pane_id
-        with open(state_path, "w") as f:
-            json.dump(pane_ids, f, indent=2)
+        pane_ids = get_pane_ids()
+        pane_ids.update(updates)
+        _atomic_write_text(state_path, json.dumps(pane_ids, separators=(",", ":")))
         return True
     except Exception:
         return False
 
 
+def set_pane_id(provider: str, pane_id: str) -> bool:
+    """Set pane ID for a provider (for daemon to use)."""
+    return set_pane_ids({provider: pane_id})
+
+
 def get_pane_ids() -> Dict[str, str]:
     """Get all registered pane IDs."""
-    state_path = get_config_dir() / "pane_ids.json"
+    state_path = _pane_ids_path()
+    try:
+        st = state_path.stat()
+    except OSError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _state_cache.get(state_path)
+    if cached is not None and cached[0] == key:
+        return dict(cached[1])
     try:
-        if state_path.exists():
-            with open(state_path, "r") as f:
-                return json.load(f)
+        with open(state_path, "r") as f:
+            pane_ids = json.load(f)
     except Exception:
-        pass
-    return {}
+        return {}
+    _state_cache[state_path] = (key, pane_ids)
+    # Copy so callers (and set_pane_ids) can't mutate the cached dict
+    return dict(pane_ids)
@@ -56,6 +56,30 @@ DANGEROUS_PATTERNS = [
     (r';\s*DROP\s+TABLE', 'SQL injection attempt'),
 ]
 
+# Patterns compiled once at import; per-message filtering should never
+# pay regex parse cost. The incoming strip patterns are additionally
+# fused into one alternation so the body is scanned once, not N times.
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[a-zA-Z]')
+# Control-char removal is a plain character-class deletion, so it maps
+# onto str.translate (a C table lookup) instead of the regex engine.
+_CTRL_DELETE_TABLE = dict.fromkeys(
+    list(range(0x00, 0x09)) + [0x0b, 0x0c] + list(range(0x0e, 0x20)) + [0x7f],
+    None,
+)
+_INCOMING_STRIP_RE = re.compile(
+    "|".join(f"(?:{p})" for p in INCOMING_STRIP_PATTERNS),
+    re.MULTILINE | re.DOTALL,
+)
+# The danger patterns are unioned into one alternation with named
+# groups: a clean message (the common case) costs one scan of the body
+# instead of one per pattern, and the group name recovers the reason
+# on the rare hit.
+_DANGER_RE = re.compile(
+    "|".join(f"(?P<d{i}>{p})" for i, (p, _) in enumerate(DANGEROUS_PATTERNS)),
+    re.IGNORECASE,
+)
+_DANGER_REASONS = [reason for _, reason in DANGEROUS_PATTERNS]
+
 # Maximum content length
 MAX_OUTGOING_LENGTH = 50000
 MAX_INCOMING_LENGTH = 10000
@@ -75,30 +99,41 @@ def filter_outgoing(content: str, max_length: int = MAX_OUTGOING_LENGTH) -> Filt
     warnings = []
     filtered = content
 
-    # Remove ANSI escape codes
-    filtered = re.sub(r'\x1b\[[0-9;]*[a-zA-Z]', '', filtered)
+    # Remove ANSI escape codes (skip the scan when no ESC is present —
+    # a single C-level `in` check, true for most short outputs)
+    if '\x1b' in filtered:
+        filtered = _ANSI_RE.sub('', filtered)
 
     # Remove control characters
-    filtered = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', filtered)
-
-    # Truncate very long lines
-    lines = filtered.split('\n')
-    truncated_lines = []
-    for line in lines:
+    filtered = filtered.translate(_CTRL_DELETE_TABLE)
+
+    # Short content can't need line or total truncation; skip the loop
+    if len(filtered) <= 500 and len(filtered) <= max_length:
+        return FilterResult(passed=True, content=filtered, warnings=warnings)
+
+    # Truncate long lines and cap total length in a single pass,
+    # stopping as soon as the length budget is spent instead of joining
+    # the full buffer and re-scanning it
+    out = []
+    total = 0  # length of '\n'.join(out)
+    lines_truncated = False
+    for line in filtered.split('\n'):
         if len(line) > 500:
-            truncated_lines.append(line[:500] + '...(truncated)')
-            warnings.append('Some lines were truncated')
-        else:
-            truncated_lines.append(line)
-    filtered = '\n'.join(truncated_lines)
-
-    # Truncate total length
-    if len(filtered) > max_length:
-        filtered = filtered[:max_length] + '\n\n...(content truncated)'
-        warnings.append(f'Content truncated to {max_length} characters')
-
-    # Remove duplicate warnings
-    warnings = list(set(warnings))
+            line = line[:500] + '...(truncated)'
+            lines_truncated = True
+        sep = 1 if out else 0
+        if total + sep + len(line) > max_length:
+            remaining = max_length - total - sep
+            if remaining >= 0:
+                out.append(line[:remaining])
+            out.append('\n...(content truncated)')
+            warnings.append(f'Content truncated to {max_length} characters')
+            break
+        out.append(line)
+        total += sep + len(line)
+    if lines_truncated:
+        warnings.append('Some lines were truncated')
+    filtered = '\n'.join(out)
 
     return FilterResult(
         passed=True,
@@ -121,19 +156,21 @@ def filter_incoming(content: str, max_length: int = MAX_INCOMING_LENGTH) -> Filt
     warnings = []
     filtered = content
 
-    # Check for dangerous patterns
-    for pattern, reason in DANGEROUS_PATTERNS:
-        if re.search(pattern, filtered, re.IGNORECASE):
-            return FilterResult(
-                passed=False,
-                content='',
-                warnings=[],
-                blocked_reason=reason,
-            )
+    # Check for dangerous patterns (single fused scan)
+    match = _DANGER_RE.search(filtered)
+    if match:
+        return FilterResult(
+            passed=False,
+            content='',
+            warnings=[],
+            blocked_reason=_DANGER_REASONS[int(match.lastgroup[1:])],
+        )
 
-    # Remove quoted text and signatures
-    for pattern in INCOMING_STRIP_PATTERNS:
-        filtered = re.sub(pattern, '', filtered, flags=re.MULTILINE | re.DOTALL)
+    # Remove quoted text and signatures (single fused scan). Every
+    # strip pattern is anchored on a newline, so a single-line body —
+    # the typical short acknowledgement — skips the regex entirely.
+    if '\n' in filtered:
+        filtered = _INCOMING_STRIP_RE.sub('', filtered)
 
     # Strip whitespace
     filtered = filtered.strip()
@@ -159,6 +196,18 @@ def filter_incoming(content: str, max_length: int = MAX_INCOMING_LENGTH) -> Filt
     )
 
 
+# Terminator tables for clean_email_body, built once so the per-line
+# loop does tuple startswith dispatch instead of a dozen separate checks
+_ON_WROTE_RE = re.compile(r'^On .+ wrote:$')
+_SIG_MARKERS = ('--', '---', '━' * 10)
+_DASH_PREFIX = '----'
+# Covers "---- Replied Message ----", "---- Forwarded Message ----" and
+# the Chinese 126/QQ mail variants
+_DASH_KEYWORDS = ('Message', '回复', '原邮件')
+# Table-like reply headers (English and Chinese)
+_TABLE_HEADER_PREFIXES = ('| From |', '| Date |', '| 发件人 |', '| 日期 |')
+
+
 def clean_email_body(body: str) -> str:
     """
     Clean email body by removing quoted text and signatures.
@@ -174,33 +223,23 @@ def clean_email_body(body: str) -> str:
         if line.startswith('>'):
             break
         # Stop at signature markers
-        if stripped in ('--', '---', '━' * 10):
+        if stripped in _SIG_MARKERS:
             break
-        # Stop at "On ... wrote:" patterns
-        if re.match(r'^On .+ wrote:$', stripped):
+        # Stop at "On ... wrote:" patterns; the cheap prefix/suffix
+        # checks rule out nearly every line before the regex confirms
+        if (stripped.startswith('On ') and stripped.endswith(' wrote:')
+                and _ON_WROTE_RE.match(stripped)):
             break
         if '写道：' in line or ('于' in line and '写道' in line):
             break
         # Stop at CCB signature
         if 'Sent via CCB' in line:
             break
-        # Stop at replied message marker (126/QQ mail format)
-        if stripped.startswith('---- Replied Message ----'):
-            break
-        if stripped.startswith('----') and 'Message' in stripped:
-            break
-        # Stop at Chinese replied message marker (126/QQ mail format)
-        if stripped.startswith('----') and '回复' in stripped:
+        # Stop at replied/forwarded message markers (126/QQ mail format)
+        if stripped.startswith(_DASH_PREFIX) and any(k in stripped for k in _DASH_KEYWORDS):
             break
-        if stripped.startswith('----') and '原邮件' in stripped:
-            break
-        # Stop at forwarded message marker
-        if stripped.startswith('---- Forwarded Message ----'):
-            break
-        # Stop at table-like reply headers (English and Chinese)
-        if stripped.startswith('| From |') or stripped.startswith('| Date |'):
-            break
-        if stripped.startswith('| 发件人 |') or stripped.startswith('| 日期 |'):
+        # Stop at table-like reply headers
+        if stripped.startswith(_TABLE_HEADER_PREFIXES):
             break
 
         clean_lines.append(line)
@@ -218,15 +257,13 @@ def sanitize_subject(subject: str, max_length: int = 100) -> str:
     return subject
 
 
+# Tuple forms take CPython's single C-level multi-prefix check per line
+_DIFF_PREFIXES = ("diff --git ", "--- ", "+++ ", "@@ ")
+_ESCAPE_PREFIXES = ("--- ", "+++ ")
+
+
 def _looks_like_diff(lines: List[str]) -> bool:
-    for line in lines:
-        if line.startswith("diff --git "):
-            return True
-        if line.startswith("--- ") or line.startswith("+++ "):
-            return True
-        if line.startswith("@@ "):
-            return True
-    return False
+    return any(line.startswith(_DIFF_PREFIXES) for line in lines)
 
 
 def escape_signature_separators(content: str) -> str:
@@ -249,7 +286,7 @@ def escape_signature_separators(content: str) -> str:
     escaped: List[str] = []
     for line in lines:
         stripped = line.strip()
-        if stripped in ("--", "---") or stripped.startswith("--- ") or stripped.startswith("+++ "):
+        if stripped in ("--", "---") or stripped.startswith(_ESCAPE_PREFIXES):
             escaped.append(f" {line}")
         else:
             escaped.append(line)
@@ -5,13 +5,94 @@ Handles user email replies and sends input to the corresponding AI pane.
 """
 
 import re
+import subprocess
+import time
 from dataclasses import dataclass
 from email.utils import parseaddr
-from typing import Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from .config import MailConfig, SUPPORTED_PROVIDERS
 from .filters import filter_incoming
 
+# Resolved once at import instead of per _get_backend call; relative
+# import first, then absolute for script-style invocation
+try:
+    from ..terminal import TmuxBackend
+except ImportError:
+    try:
+        from lib.terminal import TmuxBackend
+    except ImportError:
+        TmuxBackend = None
+
+
+# Subject/thread-id patterns compiled once; these run on every reply,
+# so they shouldn't depend on the bounded internal re cache
+_RE_CCB_OUTPUT = re.compile(r"\[ccb\]\s*(\w+)\s*output")
+_RE_RE_CCB = re.compile(r"re:\s*\[ccb\]\s*(\w+)")
+_RE_CCB_AT = re.compile(r"\[ccb\]\s*(\w+)\s*@")
+_RE_PROJECT = re.compile(r"@\s*(\w+)")
+_PROVIDERS_SET = frozenset(SUPPORTED_PROVIDERS)
+# Any supported provider name, matched in one pass instead of one
+# substring scan per provider
+_PROVIDER_ANY_RE = re.compile(
+    "(" + "|".join(re.escape(p) for p in SUPPORTED_PROVIDERS) + ")"
+)
+
+# First quote/signature marker in a reply body; one multiline search
+# replaces the per-line Python predicate loop in _clean_reply_body
+_REPLY_CUT_RE = re.compile(
+    r"(?m)^(?:>"
+    r"|[ \t]*On .* wrote:"
+    r"|[ \t]*---[ \t\r]*$"
+    r"|[ \t]*Sent via CCB"
+    r"|[ \t]*--[ \t\r]*$"
+    r"|[ \t]*━{10}[ \t\r]*$"
+    r")"
+)
+
+# Per-provider title tables, built once instead of per lookup.
+# _TITLE_SUBSTRINGS feeds substring matching against live pane titles;
+# _TITLE_MARKERS is the ordered probe list for find_pane_by_title_marker
+# (glyph variants matter there, hence the separate table).
+_TITLE_SUBSTRINGS: Dict[str, Tuple[str, ...]] = {
+    "claude": ("Claude Code", "CCB-Claude"),
+    "codex": ("CCB-Codex",),
+    "droid": ("CCB-Droid",),
+    "opencode": ("OpenCode", "OC |", "CCB-Opencode"),
+    "gemini": ("Ready", "Thinking", "CCB-Gemini"),
+}
+# Casefolded twin of _TITLE_SUBSTRINGS so each pane title is folded
+# once and compared against prefolded patterns
+_TITLE_SUBSTRINGS_CF: Dict[str, Tuple[str, ...]] = {
+    provider: tuple(p.casefold() for p in patterns)
+    for provider, patterns in _TITLE_SUBSTRINGS.items()
+}
+_TITLE_MARKERS: Dict[str, Tuple[str, ...]] = {
+    "claude": (
+        "CCB-Claude",
+        "CCB-claude",
+        "Claude Code",      # Claude Code's actual title
+        "✳ Claude Code",    # With status icon
+        "⠂ Claude Code",    # With spinner icon
+        "◇ Claude Code",    # With idle icon
+    ),
+    "codex": ("CCB-Codex", "CCB-codex"),
+    "droid": ("CCB-Droid", "CCB-droid"),
+    "opencode": (
+        "CCB-Opencode",
+        "CCB-opencode",
+        "OpenCode",
+        "OC |",             # OpenCode status prefix
+    ),
+    "gemini": (
+        "CCB-Gemini",
+        "CCB-gemini",
+        "◇  Ready",         # Gemini CLI idle state
+        "⠋  Thinking",      # Gemini CLI thinking state
+        "Gemini",           # Generic
+    ),
+}
+
 
 def _extract_email(addr: str) -> str:
     """Extract pure email address from a potentially MIME-encoded address.
@@ -39,38 +120,77 @@ class PaneInputHandler:
 
     def __init__(self, config: MailConfig):
         self.config = config
-        self._backend_cache: Dict[str, Any] = {}
-        self._pane_id_cache: Dict[str, str] = {}
+        # One shared backend: TmuxBackend is provider-agnostic, so the
+        # old per-provider cache just held N references to equivalent
+        # objects
+        self._backend: Optional[Any] = None
+        # cache_key -> pane_id, or None for a recent failed lookup
+        # (negative entries expire via _pane_id_cache_ts)
+        self._pane_id_cache: Dict[str, Optional[str]] = {}
+        self._pane_id_cache_ts: Dict[str, float] = {}
+        # (monotonic timestamp, [(pane_id, title, cwd), ...]) — one
+        # tmux list-panes spawn serves every lookup within the TTL
+        self._panes_cache: Tuple[float, List[Tuple[str, str, str]]] = (0.0, [])
+        # target_email never changes per handler; parseaddr it once
+        # instead of on every incoming reply
+        self._target_email = _extract_email(config.target_email)
+
+    def _list_all_panes(self, ttl: float = 1.0) -> List[Tuple[str, str, str]]:
+        """List all tmux panes, reusing a recent result.
+
+        Fork/exec of tmux costs a few ms per call; one listing within
+        the TTL window serves every provider/project lookup in the same
+        mail poll cycle.
+        """
+        ts, panes = self._panes_cache
+        now = time.monotonic()
+        if now - ts < ttl:
+            return panes
+
+        panes = []
+        result = subprocess.run(
+            ["tmux", "list-panes", "-a", "-F", "#{pane_id}\t#{pane_title}\t#{pane_current_path}"],
+            capture_output=True, text=True, timeout=2
+        )
+        if result.returncode == 0:
+            for line in result.stdout.strip().split("\n"):
+                if not line.strip():
+                    continue
+                parts = line.split("\t")
+                if len(parts) >= 3:
+                    panes.append((parts[0], parts[1], parts[2]))
+        self._panes_cache = (now, panes)
+        return panes
 
     def _parse_provider_from_subject(self, subject: str) -> Optional[str]:
         """Parse provider name from email subject."""
         subject_lower = subject.lower()
 
         # Check for [CCB] Provider Output pattern
-        match = re.search(r"\[ccb\]\s*(\w+)\s*output", subject_lower)
+        match = _RE_CCB_OUTPUT.search(subject_lower)
         if match:
             provider = match.group(1)
             if provider in SUPPORTED_PROVIDERS:
                 return provider
 
         # Check for Re: [CCB] Provider Output pattern
-        match = re.search(r"re:\s*\[ccb\]\s*(\w+)", subject_lower)
+        match = _RE_RE_CCB.search(subject_lower)
         if match:
             provider = match.group(1)
             if provider in SUPPORTED_PROVIDERS:
                 return provider
 
         # Check for [CCB] Provider @ project pattern
-        match = re.search(r"\[ccb\]\s*(\w+)\s*@", subject_lower)
+        match = _RE_CCB_AT.search(subject_lower)
         if match:
             provider = match.group(1)
             if provider in SUPPORTED_PROVIDERS:
                 return provider
 
         # Check for provider name anywhere in subject
-        for provider in SUPPORTED_PROVIDERS:
-            if provider in subject_lower:
-                return provider
+        match = _PROVIDER_ANY_RE.search(subject_lower)
+        if match:
+            return match.group(1)
 
         return None
 
@@ -80,7 +200,7 @@ class PaneInputHandler:
         Subject format: [CCB] Provider @ project_name
         """
         # Match @ followed by project name
-        match = re.search(r"@\s*(\w+)", subject)
+        match = _RE_PROJECT.search(subject)
         if match:
             return match.group(1)
         return None
@@ -90,29 +210,28 @@ class PaneInputHandler:
         if not thread_id:
             return None
 
-        # Thread ID format: ccb-{provider}-{timestamp}
-        match = re.search(r"ccb-(\w+)-\d+", thread_id.lower())
-        if match:
-            provider = match.group(1)
-            if provider in SUPPORTED_PROVIDERS:
-                return provider
-
-        return None
+        # Thread ID format: ccb-{provider}-{timestamp}. The format is
+        # under our control (see sender.py), so plain string ops beat
+        # spinning up the regex engine on every incoming mail.
+        tid = thread_id.lower()
+        if not tid.startswith("ccb-"):
+            return None
+        parts = tid.split("-", 2)
+        if len(parts) < 3 or not parts[2][:1].isdigit():
+            return None
+        provider = parts[1]
+        return provider if provider in _PROVIDERS_SET else None
 
     def _get_backend(self, provider: str):
-        """Get terminal backend for a provider."""
-        if provider in self._backend_cache:
-            return self._backend_cache[provider]
+        """Get the shared terminal backend (created on first use)."""
+        if self._backend is not None:
+            return self._backend
 
+        if TmuxBackend is None:
+            return None
         try:
-            # Try relative import first, then absolute import
-            try:
-                from ..terminal import TmuxBackend
-            except ImportError:
-                from lib.terminal import TmuxBackend
-            backend = TmuxBackend()
-            self._backend_cache[provider] = backend
-            return backend
+            self._backend = TmuxBackend()
+            return self._backend
         except Exception as e:
             print(f"[pane_input] Failed to create TmuxBackend: {e}")
             return None
@@ -131,40 +250,17 @@ class PaneInputHandler:
 
         try:
             # List all panes and find one matching provider title and project directory
-            import subprocess
-            result = subprocess.run(
-                ["tmux", "list-panes", "-a", "-F", "#{pane_id}\t#{pane_title}\t#{pane_current_path}"],
-                capture_output=True, text=True, timeout=2
-            )
-            if result.returncode != 0:
-                return None
+            panes = self._list_all_panes()
 
-            # Provider title patterns
-            if provider == "claude":
-                title_patterns = ["Claude Code", "CCB-Claude"]
-            elif provider == "codex":
-                title_patterns = ["CCB-Codex"]
-            elif provider == "droid":
-                title_patterns = ["CCB-Droid"]
-            elif provider == "opencode":
-                title_patterns = ["OpenCode", "OC |", "CCB-Opencode"]
-            elif provider == "gemini":
-                title_patterns = ["Ready", "Thinking", "CCB-Gemini"]
-            else:
-                title_patterns = [f"CCB-{provider.capitalize()}"]
+            # Provider title patterns (prefolded; titles from tmux can
+            # carry arbitrary-case status text)
+            title_patterns = _TITLE_SUBSTRINGS_CF.get(provider) or (f"ccb-{provider}",)
 
             project_lower = project_name.lower()
-            for line in result.stdout.strip().split("\n"):
-                if not line.strip():
-                    continue
-                parts = line.split("\t")
-                if len(parts) < 3:
-                    continue
-                pane_id, title, cwd = parts[0], parts[1], parts[2]
-
-                # Check if title matches provider
-                title_match = any(p in title for p in title_patterns)
-                if not title_match:
+            for pane_id, title, cwd in panes:
+                # Check if title matches provider (fold the title once)
+                title_cf = title.casefold()
+                if not any(p in title_cf for p in title_patterns):
                     continue
 
                 # Check if working directory contains project name
@@ -181,7 +277,14 @@ class PaneInputHandler:
         # Use project-specific cache key if project_name is provided
         cache_key = f"{provider}:{project_name}" if project_name else provider
         if cache_key in self._pane_id_cache:
-            return self._pane_id_cache[cache_key]
+            pane_id = self._pane_id_cache[cache_key]
+            if pane_id is not None:
+                return pane_id
+            # Negative entry: don't hammer tmux for panes that don't
+            # exist, but retry once the short TTL has passed
+            if time.monotonic() - self._pane_id_cache_ts.get(cache_key, 0.0) < 5.0:
+                return None
+            del self._pane_id_cache[cache_key]
 
         # Try to find pane by project name first (most specific)
         if project_name:
@@ -206,43 +309,25 @@ class PaneInputHandler:
         try:
             backend = self._get_backend(provider)
             if backend:
-                # Provider name variants for title matching
-                provider_cap = provider.capitalize()  # claude -> Claude
-
                 # Title patterns to try (in order of preference)
-                title_patterns = [
-                    f"CCB-{provider_cap}",  # CCB-Claude, CCB-Codex
-                    f"CCB-{provider}",      # CCB-claude (legacy)
-                ]
-
-                # Special patterns for specific providers
-                if provider == "claude":
-                    title_patterns.extend([
-                        "Claude Code",      # Claude Code's actual title
-                        "✳ Claude Code",    # With status icon
-                        "⠂ Claude Code",    # With spinner icon
-                        "◇ Claude Code",    # With idle icon
-                    ])
-                elif provider == "opencode":
-                    title_patterns.extend([
-                        "OpenCode",
-                        "OC |",             # OpenCode status prefix
-                    ])
-                elif provider == "gemini":
-                    title_patterns.extend([
-                        "◇  Ready",         # Gemini CLI idle state
-                        "⠋  Thinking",      # Gemini CLI thinking state
-                        "Gemini",           # Generic
-                    ])
+                title_patterns = _TITLE_MARKERS.get(provider) or (
+                    f"CCB-{provider.capitalize()}",  # CCB-Claude, CCB-Codex
+                    f"CCB-{provider}",               # CCB-claude (legacy)
+                )
 
                 for pattern in title_patterns:
                     pane_id = backend.find_pane_by_title_marker(pattern)
                     if pane_id:
-                        self._pane_id_cache[provider] = pane_id
+                        # Store under the full cache key, matching the
+                        # lookup above (a plain `provider` key here
+                        # missed on every project-scoped lookup)
+                        self._pane_id_cache[cache_key] = pane_id
                         return pane_id
         except Exception:
             pass
 
+        self._pane_id_cache[cache_key] = None
+        self._pane_id_cache_ts[cache_key] = time.monotonic()
         return None
 
     def set_pane_id(self, provider: str, pane_id: str) -> None:
@@ -270,7 +355,7 @@ class PaneInputHandler:
         """
         # Verify sender - extract pure email address for comparison
         sender_email = _extract_email(from_addr)
-        target_email = _extract_email(self.config.target_email)
+        target_email = self._target_email
         if sender_email != target_email:
             return InputResult(
                 success=False,
@@ -353,24 +438,10 @@ class PaneInputHandler:
             )
 
     def _clean_reply_body(self, body: str) -> str:
-        """Clean up reply body by removing quoted text and signatures."""
-        lines = body.splitlines()
-        clean_lines = []
-
-        for line in lines:
-            # Stop at quoted text markers
-            if line.startswith(">"):
-                break
-            if line.strip().startswith("On ") and " wrote:" in line:
-                break
-            if line.strip() == "---":
-                break
-            if line.strip().startswith("Sent via CCB"):
-                break
-            # Stop at common signature markers
-            if line.strip() in ("--", "━" * 10):
-                break
-
-            clean_lines.append(line)
-
-        return "\n".join(clean_lines).strip()
+        """Clean up reply body by removing quoted text and signatures.
+
+        A single multiline search locates the first marker and slices
+        there, instead of walking every line with Python predicates.
+        """
+        match = _REPLY_CUT_RE.search(body)
+        return (body[:match.start()] if match else body).strip()
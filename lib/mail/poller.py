@@ -4,20 +4,156 @@ IMAP polling for CCB Mail.
 Supports both traditional polling and IMAP IDLE for real-time notifications.
 """
 
+import base64
 import email
 import imaplib
-import select
+import logging
+import os
+import queue
+import quopri
+import selectors
 import ssl
 import time
 from dataclasses import dataclass
+from email import policy
+from email.header import decode_header, make_header
 from email.message import EmailMessage
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Tuple
 from threading import Thread, Event
 
 from .config import MailConfig, ImapConfig
 from .credentials import get_password
-from .router import MessageRouter, RoutedMessage
-from .attachments import extract_attachments
+from .router import AttachmentMeta, MessageRouter, RoutedMessage, _strip_html
+
+# Errors land on stderr (redirected into the daemon log); the lazy
+# %s formatting costs nothing unless the record is actually emitted
+logger = logging.getLogger("ccb.mail.poller")
+
+
+def _uid_from_head(head: bytes) -> Optional[bytes]:
+    """Pull the UID out of a FETCH record head like b'1 (UID 457 ...'."""
+    parts = head.split()
+    for i, tok in enumerate(parts[:-1]):
+        if tok.upper() in (b"UID", b"(UID") and parts[i + 1].isdigit():
+            return parts[i + 1]
+    return None
+
+
+def _parse_imap_list(s: bytes, i: int) -> Tuple[list, int]:
+    """Parse one parenthesized IMAP list starting at s[i] == b'('.
+
+    Returns (items, next_index). Atoms and quoted strings come back as
+    bytes, nested lists as lists. Raises ValueError on malformed input;
+    callers fall back to a full fetch.
+    """
+    items: list = []
+    i += 1
+    n = len(s)
+    while i < n:
+        c = s[i:i + 1]
+        if c == b"(":
+            sub, i = _parse_imap_list(s, i)
+            items.append(sub)
+        elif c == b")":
+            return items, i + 1
+        elif c == b" ":
+            i += 1
+        elif c == b'"':
+            buf = bytearray()
+            i += 1
+            while i < n and s[i:i + 1] != b'"':
+                if s[i:i + 1] == b"\\":
+                    i += 1
+                buf += s[i:i + 1]
+                i += 1
+            if i >= n:
+                raise ValueError("unterminated quoted string")
+            items.append(bytes(buf))
+            i += 1
+        elif c == b"{":
+            # Literals don't appear in BODYSTRUCTURE from compliant
+            # servers; treat as unparseable rather than guessing
+            raise ValueError("literal in list")
+        else:
+            j = i
+            while j < n and s[j:j + 1] not in (b" ", b"(", b")"):
+                j += 1
+            items.append(s[i:j])
+            i = j
+    raise ValueError("unterminated list")
+
+
+def _iter_leaf_parts(node: list, prefix: str = ""):
+    """Yield (section, leaf_node) for each leaf of a BODYSTRUCTURE tree."""
+    if node and isinstance(node[0], list):
+        # Multipart: leading child lists, then the subtype atom
+        child_num = 0
+        for item in node:
+            if not isinstance(item, list):
+                break
+            child_num += 1
+            sec = f"{prefix}.{child_num}" if prefix else str(child_num)
+            if item and isinstance(item[0], list):
+                yield from _iter_leaf_parts(item, sec)
+            else:
+                yield sec, item
+    else:
+        yield prefix or "1", node
+
+
+def _atom(value) -> str:
+    if isinstance(value, bytes) and value.upper() != b"NIL":
+        return value.decode("ascii", errors="replace").lower()
+    return ""
+
+
+def _leaf_info(node: list) -> dict:
+    """Extract the fields routing needs from a BODYSTRUCTURE leaf."""
+    params = {}
+    if len(node) > 2 and isinstance(node[2], list):
+        plist = node[2]
+        for i in range(0, len(plist) - 1, 2):
+            params[_atom(plist[i])] = plist[i + 1]
+
+    size = 0
+    if len(node) > 6 and isinstance(node[6], bytes) and node[6].isdigit():
+        size = int(node[6])
+
+    # Disposition is a trailing (type (params)) list; position varies
+    # between text and non-text parts, so scan for it
+    disposition = None
+    filename = params.get("name")
+    for item in node[7:]:
+        if isinstance(item, list) and item and isinstance(item[0], bytes):
+            kind = _atom(item[0])
+            if kind in ("attachment", "inline"):
+                disposition = kind
+                if len(item) > 1 and isinstance(item[1], list):
+                    dparams = item[1]
+                    for i in range(0, len(dparams) - 1, 2):
+                        if _atom(dparams[i]) == "filename":
+                            filename = dparams[i + 1]
+                break
+
+    return {
+        "maintype": _atom(node[0]) or "application",
+        "subtype": _atom(node[1]) if len(node) > 1 else "octet-stream",
+        "charset": _atom(params.get("charset")) or "utf-8",
+        "encoding": _atom(node[5]) if len(node) > 5 else "",
+        "size": size,
+        "disposition": disposition,
+        "filename": filename,
+    }
+
+
+def _decode_mime_words(value: str) -> str:
+    """Decode RFC 2047 encoded words in a header-derived value."""
+    if "=?" not in value:
+        return value
+    try:
+        return str(make_header(decode_header(value)))
+    except Exception:
+        return value
 
 
 @dataclass
@@ -42,6 +178,21 @@ class ImapPoller:
             self.email_addr = config.account.email
         self.router = MessageRouter(config)
         self._connection: Optional[imaplib.IMAP4_SSL] = None
+        # Mailbox currently open on _connection; SELECT is skipped when
+        # it hasn't changed (it rarely does) and the cache is cleared
+        # whenever the connection is dropped or replaced
+        self._selected_folder: Optional[str] = None
+        # CAPABILITY result cached at login; the server's feature set
+        # doesn't change between polls
+        self._capabilities: frozenset = frozenset()
+        # epoll/kqueue-backed selector for IDLE waits; select.select
+        # rebuilds its fd_set every call and caps at FD_SETSIZE
+        self._selector = selectors.DefaultSelector()
+        # Self-pipe: wake() writes one byte to break an in-progress
+        # idle_wait immediately instead of waiting out a poll tick
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
 
     def _create_connection(self) -> imaplib.IMAP4_SSL:
         """Create IMAP connection."""
@@ -65,10 +216,19 @@ class ImapPoller:
                 raise ValueError(f"No password stored for {self.email_addr}")
 
             self._connection = self._create_connection()
+            self._selected_folder = None
             self._connection.login(self.email_addr, password)
+            try:
+                status, caps = self._connection.capability()
+                if status == "OK" and caps:
+                    cap_str = (caps[0].decode()
+                               if isinstance(caps[0], bytes) else str(caps[0]))
+                    self._capabilities = frozenset(cap_str.upper().split())
+            except Exception:
+                self._capabilities = frozenset()
             return True
         except Exception as e:
-            print(f"IMAP connection failed: {e}")
+            logger.error("IMAP connection failed: %s", e)
             self._connection = None
             return False
 
@@ -80,6 +240,7 @@ class ImapPoller:
             except Exception:
                 pass
             self._connection = None
+        self._selected_folder = None
 
     def test_connection(self) -> tuple[bool, str]:
         """
@@ -104,22 +265,73 @@ class ImapPoller:
         """Check if server supports IMAP IDLE."""
         if not self._connection:
             return False
+        return "IDLE" in self._capabilities
+
+    def _exec(self, method: str, *args):
+        """Run an IMAP command, reconnecting once on a dropped link.
+
+        Servers kill idle connections (imaplib raises IMAP4.abort, or
+        the socket raises OSError); one transparent reconnect + retry
+        avoids paying a full failed poll cycle for it.
+        """
+        if not self._connection and not self.connect():
+            raise imaplib.IMAP4.error("not connected")
         try:
-            # Check CAPABILITY for IDLE support
-            status, caps = self._connection.capability()
-            if status == "OK" and caps:
-                cap_str = caps[0].decode() if isinstance(caps[0], bytes) else str(caps[0])
-                return "IDLE" in cap_str.upper()
-        except Exception:
-            pass
+            return getattr(self._connection, method)(*args)
+        except (imaplib.IMAP4.abort, OSError):
+            self.disconnect()
+            if not self.connect():
+                raise
+            if method != "select":
+                # A fresh login has no mailbox open
+                try:
+                    status, _ = self._connection.select(self.config.polling.folder)
+                    if status == "OK":
+                        self._selected_folder = self.config.polling.folder
+                except Exception:
+                    pass
+            return getattr(self._connection, method)(*args)
+
+    def select_folder(self, folder: str) -> bool:
+        """SELECT a mailbox, skipping the round trip if already open."""
+        if self._connection and folder == self._selected_folder:
+            return True
+        status, _ = self._exec("select", folder)
+        if status == "OK":
+            self._selected_folder = folder
+            return True
         return False
 
-    def idle_wait(self, timeout: int = 300) -> bool:
+    def wake(self) -> None:
+        """Interrupt an in-progress idle_wait immediately."""
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+
+    def _drain_wake(self) -> None:
+        try:
+            while os.read(self._wake_r, 64):
+                pass
+        except OSError:
+            pass
+
+    def noop(self) -> bool:
+        """Send a NOOP keepalive on the current connection."""
+        try:
+            status, _ = self._exec("noop")
+            return status == "OK"
+        except Exception:
+            return False
+
+    def idle_wait(self, timeout: int = 300, stop_event: Optional[Event] = None) -> bool:
         """
         Enter IMAP IDLE mode and wait for new mail notification.
 
         Args:
             timeout: Maximum seconds to wait in IDLE mode
+            stop_event: Optional event; when set, IDLE is exited promptly
+                       so shutdown doesn't wait out the full timeout
 
         Returns:
             True if new mail notification received, False on timeout/error
@@ -141,26 +353,52 @@ class ImapPoller:
             sock = self._connection.socket()
             start_time = time.time()
 
-            while time.time() - start_time < timeout:
-                # Use select to wait for data with 1 second timeout
-                readable, _, _ = select.select([sock], [], [], 1.0)
+            self._selector.register(sock, selectors.EVENT_READ)
+            self._selector.register(self._wake_r, selectors.EVENT_READ)
+            try:
+                while True:
+                    if stop_event is not None and stop_event.is_set():
+                        break
+                    remaining = timeout - (time.time() - start_time)
+                    if remaining <= 0:
+                        break
 
-                if readable:
+                    # One epoll/kqueue wait covering the whole window;
+                    # the self-pipe breaks it on wake() so no periodic
+                    # tick is needed for shutdown responsiveness
+                    events = self._selector.select(timeout=remaining)
+
+                    got_line = False
+                    for key, _ in events:
+                        if key.fd == self._wake_r:
+                            self._drain_wake()
+                        else:
+                            got_line = True
+                    if got_line:
+                        try:
+                            line = self._connection.readline()
+                            if line:
+                                # Check for EXISTS (new mail) or RECENT
+                                # notification. IMAP tokens are ASCII, so
+                                # matching on raw bytes skips the decode
+                                # and str allocation per untagged response
+                                upper = line.upper()
+                                if b"EXISTS" in upper or b"RECENT" in upper:
+                                    # Send DONE to exit IDLE
+                                    self._connection.send(b"DONE\r\n")
+                                    # Read the tagged response
+                                    self._connection.readline()
+                                    return True
+                        except Exception:
+                            break
+            finally:
+                for fd in (sock, self._wake_r):
                     try:
-                        line = self._connection.readline()
-                        if line:
-                            line_str = line.decode("utf-8", errors="replace").upper()
-                            # Check for EXISTS (new mail) or RECENT notification
-                            if "EXISTS" in line_str or "RECENT" in line_str:
-                                # Send DONE to exit IDLE
-                                self._connection.send(b"DONE\r\n")
-                                # Read the tagged response
-                                self._connection.readline()
-                                return True
-                    except Exception:
-                        break
+                        self._selector.unregister(fd)
+                    except (KeyError, ValueError):
+                        pass
 
-            # Timeout - send DONE to exit IDLE
+            # Timeout or stop requested - send DONE to exit IDLE
             self._connection.send(b"DONE\r\n")
             try:
                 self._connection.readline()
@@ -169,7 +407,7 @@ class ImapPoller:
             return False
 
         except Exception as e:
-            print(f"[poller] IDLE error: {e}")
+            logger.error("IDLE error: %s", e)
             return False
 
     def poll_once(self) -> PollResult:
@@ -186,73 +424,243 @@ class ImapPoller:
                 if not self.connect():
                     return PollResult(False, [], "Failed to connect")
 
-            # Select folder
+            # Select folder (no-op when it is already the open mailbox)
             folder = self.config.polling.folder
-            status, _ = self._connection.select(folder)
-            if status != "OK":
+            if not self.select_folder(folder):
                 return PollResult(False, [], f"Failed to select folder {folder}")
 
             # Search for unread messages
-            status, data = self._connection.search(None, "UNSEEN")
+            status, data = self._exec("uid", "SEARCH", None, "UNSEEN")
             if status != "OK":
                 return PollResult(False, [], "Failed to search for messages")
 
             message_ids = data[0].split()
+
+            # One FETCH round trip for every unseen message's structure
+            # and headers; per-message work below then only fetches the
+            # body part it needs. On high-latency links this collapses
+            # M round trips into 1.
+            prefetched = {}
+            if len(message_ids) > 1:
+                try:
+                    prefetched = self._batch_fetch_structures(message_ids)
+                except Exception:
+                    prefetched = {}
+
             for msg_id in message_ids:
                 try:
-                    routed = self._fetch_and_route(msg_id)
+                    routed = self._fetch_and_route(
+                        msg_id, prefetched=prefetched.get(msg_id)
+                    )
                     if routed:
-                        # Store IMAP msg_id for later marking as read
-                        routed.imap_msg_id = msg_id
+                        # Store the UID for later marking as read
+                        routed.imap_uid = msg_id
                         messages.append(routed)
                         # NOTE: Don't mark as read here - let daemon do it after successful processing
                 except Exception as e:
-                    print(f"Error processing message {msg_id}: {e}")
+                    logger.error("Error processing message %s: %s", msg_id, e)
 
             return PollResult(True, messages)
 
         except Exception as e:
             self._connection = None
+            self._selected_folder = None
             return PollResult(False, [], str(e))
 
     def mark_as_read(self, msg_id: bytes) -> bool:
-        """Mark a message as read by its IMAP message ID."""
+        """Mark a message as read by its IMAP UID."""
         if not self._connection or not msg_id:
             return False
         try:
             if self.config.polling.mark_as_read:
-                self._connection.store(msg_id, "+FLAGS", "\\Seen")
+                self._exec("uid", "STORE", msg_id, "+FLAGS", "\\Seen")
                 return True
         except Exception as e:
-            print(f"[poller] Failed to mark message as read: {e}")
+            logger.error("Failed to mark message as read: %s", e)
         return False
 
-    def _fetch_and_route(self, msg_id: bytes) -> Optional[RoutedMessage]:
-        """Fetch a message and route it."""
-        status, data = self._connection.fetch(msg_id, "(RFC822)")
-        if status != "OK" or not data or not data[0]:
-            return None
+    def _batch_fetch_structures(self, message_ids: List[bytes]) -> dict:
+        """Fetch BODYSTRUCTURE + headers for many messages in one call.
 
-        raw_email = data[0][1]
-        msg = email.message_from_bytes(raw_email)
+        Returns {uid: (structure_src, header_bytes)}. imaplib
+        interleaves the per-message records; each starts with a tuple
+        whose first element leads with the sequence number, with the
+        UID echoed further in (UID FETCH responses still lead with
+        the sequence number per RFC 3501).
+        """
+        seq = b",".join(message_ids)
+        status, data = self._exec(
+            "uid", "FETCH", seq, "(BODYSTRUCTURE BODY.PEEK[HEADER])"
+        )
+        if status != "OK" or not data:
+            return {}
+
+        results: dict = {}
+        current_num = None
+        current_src = b""
+        current_hdr = b""
+        for item in data:
+            if isinstance(item, tuple) and len(item) == 2:
+                head = item[0] if isinstance(item[0], bytes) else b""
+                num = head.split(b" ", 1)[0]
+                if num.isdigit():
+                    # Starts the next message's record; key on the
+                    # echoed UID, not the leading sequence number
+                    if current_num is not None:
+                        results[current_num] = (current_src, current_hdr)
+                    current_num, current_src, current_hdr = _uid_from_head(head), head, b""
+                else:
+                    current_src += head
+                if b"BODY[HEADER" in head.upper() and isinstance(item[1], bytes):
+                    current_hdr = item[1]
+            elif isinstance(item, bytes):
+                current_src += item
+        if current_num is not None:
+            results[current_num] = (current_src, current_hdr)
+        return results
+
+    def _fetch_and_route(
+        self,
+        msg_id: bytes,
+        prefetched: Optional[Tuple[bytes, bytes]] = None,
+    ) -> Optional[RoutedMessage]:
+        """Fetch a message and route it.
+
+        Tries the structured fetch first: BODYSTRUCTURE plus headers to
+        decide what is needed, then just the one text part. Attachment
+        metadata comes straight from BODYSTRUCTURE, so their bytes are
+        never downloaded during routing — a 20 MB attachment no longer
+        costs 20 MB of transfer and base64 decode per poll. Falls back
+        to the full RFC822 download when the server response can't be
+        parsed.
+        """
+        try:
+            routed = self._fetch_and_route_structured(msg_id, prefetched)
+        except Exception:
+            routed = None
+        if routed is not None:
+            return routed
+        return self._fetch_and_route_full(msg_id)
 
-        # Route the message
-        routed = self.router.route_email_message(msg)
+    def _fetch_and_route_structured(
+        self,
+        msg_id: bytes,
+        prefetched: Optional[Tuple[bytes, bytes]] = None,
+    ) -> Optional[RoutedMessage]:
+        """Route from BODYSTRUCTURE + headers + one body part fetch."""
+        if prefetched is not None:
+            structure_src, header_bytes = prefetched
+        else:
+            # BODY.PEEK leaves \Seen unset, preserving the daemon's
+            # mark-only-after-success semantics
+            status, data = self._exec(
+                "uid", "FETCH", msg_id, "(BODYSTRUCTURE BODY.PEEK[HEADER])"
+            )
+            if status != "OK" or not data:
+                return None
+
+            structure_src = b""
+            header_bytes = b""
+            for item in data:
+                if isinstance(item, tuple) and len(item) == 2:
+                    if isinstance(item[0], bytes):
+                        structure_src += item[0]
+                    if b"BODY[HEADER" in item[0].upper() and isinstance(item[1], bytes):
+                        header_bytes = item[1]
+                elif isinstance(item, bytes):
+                    structure_src += item
+        if not header_bytes:
+            return None
 
-        # Extract attachments
+        idx = structure_src.upper().find(b"BODYSTRUCTURE")
+        if idx == -1:
+            return None
+        start = structure_src.find(b"(", idx)
+        if start == -1:
+            return None
+        structure, _ = _parse_imap_list(structure_src, start)
+
+        # Pick body part and collect attachment metadata in one pass
+        text_sec = text_info = None
+        html_sec = html_info = None
+        attachments = []
+        for section, leaf in _iter_leaf_parts(structure):
+            info = _leaf_info(leaf)
+            if info["disposition"] == "attachment":
+                if info["filename"]:
+                    filename = info["filename"].decode("utf-8", errors="replace") \
+                        if isinstance(info["filename"], bytes) else str(info["filename"])
+                    attachments.append(AttachmentMeta(
+                        filename=_decode_mime_words(filename),
+                        content_type=f"{info['maintype']}/{info['subtype']}",
+                        size=info["size"],
+                    ))
+                continue
+            if info["maintype"] != "text":
+                continue
+            if info["subtype"] == "plain" and text_sec is None:
+                text_sec, text_info = section, info
+            elif info["subtype"] == "html" and html_sec is None:
+                html_sec, html_info = section, info
+
+        section, info = (text_sec, text_info) if text_sec else (html_sec, html_info)
+        body = ""
+        if section:
+            body = self._fetch_body_part(msg_id, section, info)
+            if info["subtype"] == "html":
+                body = _strip_html(body)
+
+        msg = email.message_from_bytes(header_bytes)
         message_id = msg.get("Message-ID", str(msg_id))
-        attachments = extract_attachments(msg, message_id)
-        routed.attachments = [
-            {
-                "filename": a.filename,
-                "local_path": str(a.local_path),
-                "content_type": a.content_type,
-                "size": a.size,
-            }
-            for a in attachments
-        ]
+        return self.router.route_message(
+            to_addr=msg.get("To", ""),
+            from_addr=msg.get("From", ""),
+            subject=str(msg.get("Subject", "") or ""),
+            body=body,
+            message_id=message_id,
+            references=msg.get("References", ""),
+            attachments=attachments,
+        )
+
+    def _fetch_body_part(self, msg_id: bytes, section: str, info: dict) -> str:
+        """Fetch and decode a single body part by section number."""
+        status, data = self._exec("uid", "FETCH", msg_id, f"(BODY.PEEK[{section}])")
+        if status != "OK" or not data or not isinstance(data[0], tuple):
+            return ""
+        payload = data[0][1]
+        if not isinstance(payload, bytes):
+            return ""
+        encoding = info["encoding"]
+        if encoding == "base64":
+            try:
+                payload = base64.b64decode(payload)
+            except Exception:
+                pass
+        elif encoding == "quoted-printable":
+            payload = quopri.decodestring(payload)
+        try:
+            return payload.decode(info["charset"], errors="replace")
+        except LookupError:
+            return payload.decode("utf-8", errors="replace")
+
+    def _fetch_and_route_full(self, msg_id: bytes) -> Optional[RoutedMessage]:
+        """Full-message fallback: download RFC822 and route it."""
+        status, data = self._exec("uid", "FETCH", msg_id, "(RFC822)")
+        if status != "OK" or not data or not data[0]:
+            return None
+
+        raw_email = data[0][1]
+        # policy.default yields EmailMessage parts whose get_content()
+        # decodes transfer encoding and charset in a single pass
+        msg = email.message_from_bytes(raw_email, policy=policy.default)
 
-        return routed
+        # Route the message. The router's single walk already collects
+        # attachment metadata (filename/type/size) without decoding;
+        # don't overwrite it with eagerly materialized disk copies —
+        # handlers that need the bytes call extract_attachments on
+        # demand, so a 10 MB PDF no longer lives in RAM decoded plus
+        # again on disk for every routed message.
+        return self.router.route_email_message(msg)
 
 
 class ImapPollerDaemon:
@@ -262,6 +670,7 @@ class ImapPollerDaemon:
         self,
         config: MailConfig,
         on_message: Callable[[RoutedMessage], bool],
+        idle_callback: Optional[Callable[[], None]] = None,
     ):
         """Initialize the polling daemon.
 
@@ -269,14 +678,25 @@ class ImapPollerDaemon:
             config: Mail configuration
             on_message: Callback for handling messages. Should return True if
                        message was successfully processed, False otherwise.
+            idle_callback: Optional housekeeping hook invoked once per poll
+                          cycle on the poller thread (e.g. periodic cleanup).
         """
         self.config = config
         self.on_message = on_message
+        self.idle_callback = idle_callback
         self.poller = ImapPoller(config)
         self._stop_event = Event()
         self._thread: Optional[Thread] = None
         self._use_idle = getattr(config.polling, 'use_idle', True)
         self._idle_timeout = getattr(config.polling, 'idle_timeout', 300)
+        # on_message runs on a separate dispatch thread so a slow
+        # handler can't keep the poller thread out of IDLE. The IMAP
+        # connection is not thread-safe, so fetching and mark-as-read
+        # stay on the poller thread; the ack queue carries results back.
+        self._dispatch_q: queue.Queue = queue.Queue(maxsize=64)
+        self._ack_q: queue.Queue = queue.Queue()
+        self._dispatch_thread: Optional[Thread] = None
+        self._in_flight: set = set()
 
     def start(self) -> None:
         """Start the polling daemon."""
@@ -284,15 +704,25 @@ class ImapPollerDaemon:
             return
 
         self._stop_event.clear()
+        self._dispatch_thread = Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatch_thread.start()
         self._thread = Thread(target=self._poll_loop, daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
         """Stop the polling daemon."""
         self._stop_event.set()
+        self.poller.wake()  # break out of IDLE immediately
+        if self._dispatch_thread:
+            self._dispatch_q.put(None)  # sentinel wakes the worker
+            self._dispatch_thread.join(timeout=5)
+            self._dispatch_thread = None
         if self._thread:
             self._thread.join(timeout=5)
             self._thread = None
+        # Flush acks for messages that finished during shutdown while
+        # the connection is still usable
+        self._drain_acks()
         self.poller.disconnect()
 
     def is_running(self) -> bool:
@@ -300,19 +730,44 @@ class ImapPollerDaemon:
         return self._thread is not None and self._thread.is_alive()
 
     def _process_messages(self, result: PollResult) -> None:
-        """Process polled messages."""
+        """Hand polled messages to the dispatch worker."""
         if result.success:
             for msg in result.messages:
-                try:
-                    success = self.on_message(msg)
-                    # Only mark as read if message was successfully processed
-                    if success and msg.imap_msg_id:
-                        self.poller.mark_as_read(msg.imap_msg_id)
-                except Exception as e:
-                    print(f"Error handling message: {e}")
+                if msg.message_id and msg.message_id in self._in_flight:
+                    # Still unacked from a previous poll (messages stay
+                    # \\Unseen until processed); don't process twice
+                    continue
+                self._in_flight.add(msg.message_id)
+                self._dispatch_q.put(msg)
         else:
             if result.error:
-                print(f"Poll error: {result.error}")
+                logger.error("Poll error: %s", result.error)
+
+    def _dispatch_loop(self) -> None:
+        """Worker: run on_message off the poller thread."""
+        while True:
+            msg = self._dispatch_q.get()
+            if msg is None:
+                break
+            try:
+                success = self.on_message(msg)
+            except Exception as e:
+                logger.exception("Error handling message")
+                success = False
+            self._ack_q.put((msg.message_id, msg.imap_uid, success))
+
+    def _drain_acks(self) -> None:
+        """Apply handler results on the poller thread (owns the IMAP link)."""
+        while True:
+            try:
+                message_id, imap_uid, success = self._ack_q.get_nowait()
+            except queue.Empty:
+                break
+            # Only mark as read if message was successfully processed;
+            # failures leave the message unseen for the next poll
+            if success and imap_uid:
+                self.poller.mark_as_read(imap_uid)
+            self._in_flight.discard(message_id)
 
     def _poll_loop(self) -> None:
         """Main polling loop with IDLE support."""
@@ -332,32 +787,64 @@ class ImapPollerDaemon:
 
         while not self._stop_event.is_set():
             try:
+                # Apply results from the dispatch worker before polling
+                # so processed messages get marked read first
+                self._drain_acks()
+
                 # First, poll for any existing unread messages
                 result = self.poller.poll_once()
                 self._process_messages(result)
 
+                # Housekeeping hook (cleanup etc.) piggybacks on the
+                # poll cycle so no dedicated timer thread is needed
+                if self.idle_callback:
+                    try:
+                        self.idle_callback()
+                    except Exception as e:
+                        logger.error("Idle callback error: %s", e)
+
                 if idle_supported and self._use_idle:
                     # Use IDLE mode - wait for new mail notification
                     if not self._stop_event.is_set():
                         # Select folder before IDLE
                         if self.poller._connection:
                             try:
-                                self.poller._connection.select(self.config.polling.folder)
+                                self.poller.select_folder(self.config.polling.folder)
                             except Exception:
                                 pass
 
-                        # Enter IDLE and wait
-                        got_mail = self.poller.idle_wait(timeout=min(self._idle_timeout, 60))
+                        # Enter IDLE and wait. RFC 2177 suggests
+                        # re-issuing IDLE at most every 29 minutes; the
+                        # old 60s cap forced a full re-poll per minute
+                        # even on an idle mailbox. While messages are
+                        # in flight on the dispatch worker, wake often
+                        # so their acks get applied promptly.
+                        idle_timeout = min(self._idle_timeout, 29 * 60)
+                        if self._in_flight:
+                            idle_timeout = min(idle_timeout, 5)
+                        got_mail = self.poller.idle_wait(
+                            timeout=idle_timeout,
+                            stop_event=self._stop_event,
+                        )
                         if got_mail:
                             # New mail arrived - poll immediately
                             continue
                         # Timeout - loop will re-poll and re-enter IDLE
                 else:
-                    # Traditional polling - wait for interval
-                    self._stop_event.wait(interval)
+                    # Traditional polling - wait for interval, sending
+                    # a NOOP keepalive every ~5 minutes so servers
+                    # don't idle-kill the connection between polls
+                    remaining = interval
+                    while remaining > 0 and not self._stop_event.is_set():
+                        chunk = min(remaining, 5 if self._in_flight else 300)
+                        self._stop_event.wait(chunk)
+                        remaining -= chunk
+                        self._drain_acks()
+                        if remaining > 0 and not self._in_flight:
+                            self.poller.noop()
 
             except Exception as e:
-                print(f"Poll loop error: {e}")
+                logger.error("Poll loop error: %s", e)
                 # On error, disconnect and retry after interval
                 self.poller.disconnect()
                 self._stop_event.wait(interval)
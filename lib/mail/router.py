@@ -9,9 +9,11 @@ Routes incoming emails to the appropriate AI provider based on:
 
 import html as html_lib
 import re
+from html.parser import HTMLParser
 from dataclasses import dataclass, field
 from typing import Optional, Tuple, List
 from email.message import EmailMessage
+from email.utils import parseaddr
 
 from .config import MailConfig, SUPPORTED_PROVIDERS
 
@@ -26,6 +28,119 @@ DEFAULT_SUBJECT_PREFIXES = {
 }
 
 
+# Provider membership tests run per inbound mail; frozenset gives an
+# O(1) hash lookup instead of scanning the list
+_SUPPORTED = frozenset(SUPPORTED_PROVIDERS)
+
+# Routing patterns compiled once at import; these run per inbound mail
+_PLUS_ALIAS_RE = re.compile(r"([^+]+)\+([^@]+)@(.+)")
+_THREAD_ID_RE = re.compile(r"ccb-(\w+)-\d+")
+# HTML stripping patterns, kept as the fallback path of _strip_html
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style).*?>.*?</\1>", re.I | re.S)
+_BR_RE = re.compile(r"<br\s*/?>", re.I)
+_P_END_RE = re.compile(r"</p\s*>", re.I)
+_TAG_RE = re.compile(r"<[^>]+>", re.S)
+
+
+class _TextExtractor(HTMLParser):
+    """One-pass text extraction from HTML mail bodies.
+
+    Skips script/style subtrees and renders <br>/</p> as newlines.
+    A single tokenizing pass replaces the old stacked regex subs, whose
+    non-greedy script/style pattern could backtrack heavily on
+    malformed mail; entity unescaping comes free via convert_charrefs.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._skip_depth = 0
+        self.parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip_depth += 1
+        elif tag == "br":
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag == "p":
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def _strip_html(text: str) -> str:
+    """Extract readable text from an HTML body."""
+    parser = _TextExtractor()
+    try:
+        parser.feed(text)
+        parser.close()
+    except Exception:
+        # HTMLParser is lenient, but guard anyway: fall back to the
+        # regex passes rather than dropping the body
+        cleaned = _SCRIPT_STYLE_RE.sub("", text)
+        cleaned = _BR_RE.sub("\n", cleaned)
+        cleaned = _P_END_RE.sub("\n", cleaned)
+        cleaned = _TAG_RE.sub("", cleaned)
+        return html_lib.unescape(cleaned).strip()
+    return "".join(parser.parts).strip()
+
+
+def _leaf_parts(msg):
+    """Yield only leaf (non-container) MIME parts, depth-first.
+
+    msg.walk() also yields the multipart containers, forcing an
+    is_multipart branch on every iteration; this recurses through
+    containers and yields roughly half as many items on typical
+    multipart/alternative mail. Works on both EmailMessage and the
+    compat Message class (get_payload() returns the subpart list for
+    containers).
+    """
+    if msg.is_multipart():
+        for part in msg.get_payload():
+            yield from _leaf_parts(part)
+    else:
+        yield msg
+
+
+def _attachment_size(part: EmailMessage) -> int:
+    """Attachment size in bytes without decoding the payload.
+
+    Prefers an explicit Content-Length header; otherwise derives the
+    size from the still-encoded payload string (for base64, decoded
+    size is ~3/4 of the encoded length). This is metadata only — the
+    actual bytes are extracted later, on demand.
+    """
+    declared = part.get("Content-Length")
+    if declared:
+        try:
+            return int(declared)
+        except (TypeError, ValueError):
+            pass
+    raw_len = len(part.get_payload(decode=False) or "")
+    cte = (part.get("Content-Transfer-Encoding") or "").lower()
+    if cte == "base64":
+        return raw_len * 3 // 4
+    return raw_len
+
+
+@dataclass(slots=True, frozen=True)
+class AttachmentMeta:
+    """Metadata for one attachment (bytes are never downloaded).
+
+    Slotted and frozen: a mail with many attachments pays ~96 bytes per
+    entry instead of a keyed dict apiece.
+    """
+    filename: str
+    content_type: str
+    size: int
+
+
 @dataclass
 class RoutedMessage:
     """A routed email message."""
@@ -36,8 +151,8 @@ class RoutedMessage:
     message_id: str
     thread_id: Optional[str] = None
     references: Optional[str] = None
-    attachments: list = field(default_factory=list)
-    imap_msg_id: Optional[bytes] = None  # IMAP message ID for marking as read
+    attachments: List[AttachmentMeta] = field(default_factory=list)
+    imap_uid: Optional[bytes] = None  # IMAP UID for marking as read
 
 
 class MessageRouter:
@@ -47,6 +162,22 @@ class MessageRouter:
         self.config = config
         # Support both v1 (routing) and v2 (pane_hooks) config
         self._has_routing = hasattr(config, 'routing')
+        # Config is fixed for the router's lifetime, so the lookup
+        # structures for the per-message hot path are built once here
+        # instead of per call. All subject prefixes are fused into one
+        # alternation: a single C-level match replaces one startswith
+        # per provider.
+        prefixes = self._get_subject_prefixes()
+        self._subject_re = re.compile(
+            r"^\s*(" + "|".join(re.escape(p) for p in prefixes.values()) + r")",
+            re.IGNORECASE,
+        ) if prefixes else None
+        self._prefix_to_provider = {
+            prefix.lower(): provider for provider, prefix in prefixes.items()
+        }
+        self._allowed_senders_lc = frozenset(
+            a.lower() for a in self._get_allowed_senders()
+        )
 
     def _get_routing_mode(self) -> str:
         """Get routing mode (v1 only)."""
@@ -92,16 +223,13 @@ class MessageRouter:
         - allowed_senders list is empty (accept all)
         - sender email is in the allowed list
         """
-        allowed = self._get_allowed_senders()
-        if not allowed:
+        if not self._allowed_senders_lc:
             return True  # Empty list = accept all
 
-        # Extract email from "Name <email>" format
-        email = from_addr
-        if "<" in from_addr and ">" in from_addr:
-            email = from_addr.split("<")[1].split(">")[0]
-
-        return email.lower() in [a.lower() for a in allowed]
+        # parseaddr handles quoted display names and comments, which the
+        # old split("<") extraction got wrong
+        addr = parseaddr(from_addr)[1]
+        return (addr or from_addr).lower() in self._allowed_senders_lc
 
     def get_reply_address(self, original_from: str) -> str:
         """
@@ -122,11 +250,11 @@ class MessageRouter:
 
         Example: user+claude@gmail.com -> claude
         """
-        match = re.match(r"([^+]+)\+([^@]+)@(.+)", to_addr)
+        match = _PLUS_ALIAS_RE.match(to_addr)
         if match:
             alias = match.group(2).lower()
             # Check if it's a known provider
-            if alias in SUPPORTED_PROVIDERS:
+            if alias in _SUPPORTED:
                 return alias
         return None
 
@@ -139,15 +267,14 @@ class MessageRouter:
         Returns:
             Tuple of (provider, cleaned_subject)
         """
-        prefixes = self._get_subject_prefixes()
-        subject_lower = subject.lower().strip()
+        if self._subject_re is None:
+            return None, subject
 
-        for provider, prefix in prefixes.items():
-            prefix_lower = prefix.lower()
-            if subject_lower.startswith(prefix_lower):
-                # Remove prefix and clean up
-                cleaned = subject[len(prefix):].strip()
-                return provider, cleaned
+        match = self._subject_re.match(subject)
+        if match:
+            provider = self._prefix_to_provider[match.group(1).lower()]
+            # Remove prefix and clean up
+            return provider, subject[match.end():].strip()
 
         return None, subject
 
@@ -159,10 +286,10 @@ class MessageRouter:
         """
         if not thread_id:
             return None
-        match = re.search(r"ccb-(\w+)-\d+", thread_id.lower())
+        match = _THREAD_ID_RE.search(thread_id.lower())
         if match:
             provider = match.group(1)
-            if provider in SUPPORTED_PROVIDERS:
+            if provider in _SUPPORTED:
                 return provider
         return None
 
@@ -197,8 +324,9 @@ class MessageRouter:
         # Extract thread ID from References header
         thread_id = None
         if references:
-            # Use first reference as thread ID
-            refs = references.strip().split()
+            # Use first reference as thread ID (split() with no args
+            # already ignores surrounding whitespace)
+            refs = references.split()
             if refs:
                 thread_id = refs[0].strip("<>")
                 # V2: Try to extract provider from thread ID first
@@ -246,39 +374,52 @@ class MessageRouter:
         references = msg.get("References", "")
 
         def _decode_payload(part: EmailMessage) -> str:
+            # get_content() (policy.default parses) decodes transfer
+            # encoding and charset in one pass without an intermediate
+            # bytes buffer; compat Message objects lack it
+            try:
+                content = part.get_content()
+                if isinstance(content, str):
+                    return content
+            except Exception:
+                pass
             payload = part.get_payload(decode=True)
             if not payload:
                 return ""
             charset = part.get_content_charset() or "utf-8"
             return payload.decode(charset, errors="replace")
 
-        def _strip_html(text: str) -> str:
-            # Remove script/style blocks
-            cleaned = re.sub(r"(?is)<(script|style).*?>.*?</\\1>", "", text)
-            # Convert common line breaks to newlines
-            cleaned = re.sub(r"(?i)<br\\s*/?>", "\n", cleaned)
-            cleaned = re.sub(r"(?i)</p\\s*>", "\n", cleaned)
-            # Remove remaining tags
-            cleaned = re.sub(r"(?s)<[^>]+>", "", cleaned)
-            return html_lib.unescape(cleaned).strip()
-
-        # Extract body (prefer text/plain; fallback to text/html)
+        # Extract body (prefer text/plain; fallback to text/html) and
+        # attachment metadata in a single walk. Only the chosen body
+        # part is decoded; attachment payloads stay in their transfer
+        # encoding — decoding them just to take len() pulled every
+        # base64 blob into memory.
         body = ""
         html_body = ""
+        attachments = []
         if msg.is_multipart():
-            for part in msg.walk():
-                if part.is_multipart():
+            text_part = None
+            html_part = None
+            for part in _leaf_parts(msg):
+                content_disposition = part.get("Content-Disposition", "")
+                if "attachment" in content_disposition:
+                    filename = part.get_filename()
+                    if filename:
+                        attachments.append(AttachmentMeta(
+                            filename=filename,
+                            content_type=part.get_content_type(),
+                            size=_attachment_size(part),
+                        ))
                     continue
-                if part.get_content_type() == "text/plain":
-                    body = _decode_payload(part)
-                    break
-            if not body:
-                for part in msg.walk():
-                    if part.is_multipart():
-                        continue
-                    if part.get_content_type() == "text/html":
-                        html_body = _decode_payload(part)
-                        break
+                content_type = part.get_content_type()
+                if content_type == "text/plain" and text_part is None:
+                    text_part = part
+                elif content_type == "text/html" and html_part is None:
+                    html_part = part
+            if text_part is not None:
+                body = _decode_payload(text_part)
+            if not body and html_part is not None:
+                html_body = _decode_payload(html_part)
         else:
             content_type = msg.get_content_type()
             if content_type == "text/plain":
@@ -291,20 +432,6 @@ class MessageRouter:
         if not body and html_body:
             body = _strip_html(html_body)
 
-        # Extract attachments info
-        attachments = []
-        if msg.is_multipart():
-            for part in msg.walk():
-                content_disposition = part.get("Content-Disposition", "")
-                if "attachment" in content_disposition:
-                    filename = part.get_filename()
-                    if filename:
-                        attachments.append({
-                            "filename": filename,
-                            "content_type": part.get_content_type(),
-                            "size": len(part.get_payload(decode=True) or b""),
-                        })
-
         return self.route_message(
             to_addr=to_addr,
             from_addr=from_addr,
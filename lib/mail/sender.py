@@ -20,6 +20,10 @@ from .filters import filter_outgoing, sanitize_subject
 
 T = TypeVar('T')
 
+# A cached connection used again within this window skips the NOOP
+# liveness probe; past it, servers may have silently dropped us
+_PROBE_IDLE_SECS = 60.0
+
 
 def _retry_on_failure(
     func: Callable[[], T],
@@ -74,6 +78,8 @@ class SmtpSender:
             self.smtp_config = config.account.smtp
             self.email_addr = config.account.email
         self._connection: Optional[smtplib.SMTP] = None
+        # Wall-clock time of the last successful command on _connection
+        self._last_used_ts: float = 0.0
 
     def _create_connection(self) -> smtplib.SMTP:
         """Create SMTP connection."""
@@ -104,6 +110,7 @@ class SmtpSender:
 
             self._connection = self._create_connection()
             self._connection.login(self.email_addr, password)
+            self._last_used_ts = time.time()
             return True
         except Exception as e:
             print(f"SMTP connection failed: {e}")
@@ -119,6 +126,39 @@ class SmtpSender:
                 pass
             self._connection = None
 
+    def __enter__(self) -> "SmtpSender":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.disconnect()
+
+    def _ensure_alive(self) -> None:
+        """Reuse the cached SMTP connection, reconnecting if it died.
+
+        TCP + TLS + AUTH dominates per-message cost, so the connection
+        is kept across sends. One used recently is trusted as-is; an
+        idle one gets a cheap NOOP probe first, since servers drop
+        quiet connections without notice.
+        """
+        if self._connection is not None:
+            if time.time() - self._last_used_ts <= _PROBE_IDLE_SECS:
+                return
+            try:
+                status, _ = self._connection.noop()
+                if status == 250:
+                    self._last_used_ts = time.time()
+                    return
+            except (smtplib.SMTPException, OSError):
+                pass
+            # Dead connection; drop it without waiting on QUIT
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+        if not self.connect():
+            raise ConnectionError("Failed to connect to SMTP")
+
     def test_connection(self) -> tuple[bool, str]:
         """
         Test SMTP connection.
@@ -134,6 +174,113 @@ class SmtpSender:
         except Exception as e:
             return False, f"SMTP connection error: {e}"
 
+
+    def _build_reply_message(
+        self,
+        to_addr: str,
+        subject: str,
+        body: str,
+        in_reply_to: Optional[str] = None,
+        references: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> MIMEMultipart:
+        """Build a reply message; shared by single and batch sends."""
+        msg = MIMEMultipart("alternative")
+        msg["From"] = self.email_addr
+        msg["To"] = to_addr
+        msg["Subject"] = subject
+        msg["Date"] = formatdate(localtime=True)
+        msg["Message-ID"] = make_msgid()
+
+        # Threading headers
+        if in_reply_to:
+            msg["In-Reply-To"] = in_reply_to
+        if references:
+            msg["References"] = references
+
+        # Add provider signature
+        body_with_sig = body
+        if provider:
+            body_with_sig = f"{body}\n\n---\nSent via CCB ({provider})"
+
+        msg.attach(MIMEText(body_with_sig, "plain", "utf-8"))
+        return msg
+
+    def _build_output_message(
+        self,
+        to_addr: str,
+        subject: str,
+        body: str,
+        thread_id: str,
+        provider: str,
+    ) -> MIMEMultipart:
+        """Build a pane-output notification; shared by single and batch sends."""
+        msg = MIMEMultipart("alternative")
+        msg["From"] = self.email_addr
+        msg["To"] = to_addr
+        msg["Subject"] = subject
+        msg["Date"] = formatdate(localtime=True)
+        msg["Message-ID"] = f"<{thread_id}@ccb>"
+        msg["X-CCB-Thread-ID"] = thread_id
+        msg["X-CCB-Provider"] = provider
+        msg.attach(MIMEText(body, "plain", "utf-8"))
+        return msg
+
+    def send_many(
+        self,
+        messages: List[MIMEMultipart],
+        max_retries: int = 3,
+    ) -> List[tuple[bool, str]]:
+        """
+        Send several prepared messages on one cached connection.
+
+        TLS + AUTH is paid once for the whole batch instead of per
+        message. A refused recipient fails only its own message (the
+        transaction is RSET and the batch continues); a dropped
+        connection is reopened and the batch resumes from the message
+        that failed.
+
+        Args:
+            messages: Messages from _build_reply_message/_build_output_message
+            max_retries: Maximum reconnect attempts for the batch
+
+        Returns:
+            One (success, message_id or error) tuple per message, in order
+        """
+        results: List[tuple[bool, str]] = []
+
+        def _send_rest() -> List[tuple[bool, str]]:
+            self._ensure_alive()
+            while len(results) < len(messages):
+                msg = messages[len(results)]
+                try:
+                    self._connection.send_message(msg)
+                    self._last_used_ts = time.time()
+                    results.append((True, msg["Message-ID"]))
+                except smtplib.SMTPRecipientsRefused as e:
+                    # Only this message is bad; abort its transaction
+                    # and keep going with the rest
+                    try:
+                        self._connection.rset()
+                    except Exception:
+                        pass
+                    results.append((False, str(e)))
+            return results
+
+        def _on_retry(attempt: int, e: Exception) -> None:
+            print(f"[smtp] Retry {attempt}/{max_retries} after error: {e}")
+            # Reset connection for retry; results keeps our position
+            self._connection = None
+
+        try:
+            return _retry_on_failure(_send_rest, max_retries=max_retries, retry_delay=2.0, on_retry=_on_retry)
+        except Exception as e:
+            self._connection = None
+            # Messages never attempted fail with the connection error
+            while len(results) < len(messages):
+                results.append((False, str(e)))
+            return results
+
     def send_reply(
         self,
         to_addr: str,
@@ -160,35 +307,15 @@ class SmtpSender:
             Tuple of (success, message_id or error)
         """
         def _send() -> tuple[bool, str]:
-            if not self._connection:
-                if not self.connect():
-                    raise ConnectionError("Failed to connect to SMTP")
-
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["From"] = self.email_addr
-            msg["To"] = to_addr
-            msg["Subject"] = subject
-            msg["Date"] = formatdate(localtime=True)
-            msg["Message-ID"] = make_msgid()
-
-            # Threading headers
-            if in_reply_to:
-                msg["In-Reply-To"] = in_reply_to
-            if references:
-                msg["References"] = references
-
-            # Add provider signature
-            body_with_sig = body
-            if provider:
-                body_with_sig = f"{body}\n\n---\nSent via CCB ({provider})"
-
-            # Add body
-            text_part = MIMEText(body_with_sig, "plain", "utf-8")
-            msg.attach(text_part)
-
-            # Send
+            self._ensure_alive()
+            msg = self._build_reply_message(
+                to_addr, subject, body,
+                in_reply_to=in_reply_to,
+                references=references,
+                provider=provider,
+            )
             self._connection.send_message(msg)
+            self._last_used_ts = time.time()
             return True, msg["Message-ID"]
 
         def _on_retry(attempt: int, e: Exception) -> None:
@@ -283,26 +410,10 @@ Reply to this email to send commands to {provider.capitalize()}
 {separator}"""
 
         def _send() -> tuple[bool, str]:
-            if not self._connection:
-                if not self.connect():
-                    raise ConnectionError("Failed to connect to SMTP")
-
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["From"] = self.email_addr
-            msg["To"] = to_addr
-            msg["Subject"] = subject
-            msg["Date"] = formatdate(localtime=True)
-            msg["Message-ID"] = f"<{thread_id}@ccb>"
-            msg["X-CCB-Thread-ID"] = thread_id
-            msg["X-CCB-Provider"] = provider
-
-            # Add body
-            text_part = MIMEText(body, "plain", "utf-8")
-            msg.attach(text_part)
-
-            # Send
+            self._ensure_alive()
+            msg = self._build_output_message(to_addr, subject, body, thread_id, provider)
             self._connection.send_message(msg)
+            self._last_used_ts = time.time()
             return True, msg["Message-ID"]
 
         def _on_retry(attempt: int, e: Exception) -> None:
@@ -5,6 +5,7 @@ Maps email thread IDs to CCB session IDs for conversation continuity.
 """
 
 import json
+import os
 import time
 from dataclasses import dataclass, asdict
 from pathlib import Path
@@ -74,12 +75,21 @@ class ThreadStore:
             self._loaded = True
 
     def _save(self) -> None:
-        """Save threads to file."""
+        """Save threads to file atomically.
+
+        Runs on every set()/delete(), so it stays lean: compact
+        separators halve the payload versus indent=2, and writing a
+        sibling tempfile then os.replace means a crash mid-write can
+        never truncate the mapping file. Permissions are set at
+        creation, replacing the chmod syscall per save.
+        """
         ensure_config_dir()
         data = {tid: m.to_dict() for tid, m in self._cache.items()}
-        with open(self.threads_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-        self.threads_file.chmod(0o600)
+        tmp = self.threads_file.with_suffix(".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self.threads_file)
 
     def get(self, thread_id: str) -> Optional[ThreadMapping]:
         """Get session mapping for a thread ID."""